@@ -3,8 +3,10 @@
 from __future__ import annotations
 
 import logging
+import re
+import time
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import Callable, List, Optional, Tuple, TypeVar
 
 import typer
 from rich.progress import (
@@ -24,13 +26,18 @@ from image_automation.core.config import (
     TextureConfig,
     ValidationConfig,
     WatermarkConfig,
+    default_worker_count,
 )
-from image_automation.core.progress import ProgressUpdate
+from image_automation.core.progress import PROGRESS_LEVEL_MESSAGE, ProgressUpdate
 from image_automation.processing.pipeline import process_batch
 from image_automation.utils.logging import setup_logging
 
 app = typer.Typer(help="批量图片风格化与防检测处理工具。")
 
+T = TypeVar("T", int, float)
+
+PROGRESS_REFRESH_INTERVAL = 0.1  # 秒，进度条最多每 100ms 刷新一次
+
 
 def _parse_ratio(value: str) -> Tuple[int, int]:
     parts = value.split(":")
@@ -46,26 +53,48 @@ def _parse_ratio(value: str) -> Tuple[int, int]:
     return w, h
 
 
-def _parse_count_range(value: Tuple[int, int]) -> Tuple[int, int]:
-    low, high = value
+def _parse_pair(value: str, cast: Callable[[str], T]) -> Tuple[T, T]:
+    """解析形如 ``3,5`` 或 ``3 5`` 的范围参数，并保证返回 (低, 高)。
+
+    参数是单个字符串：旧版不加引号的 ``--watermark-count 3 5`` 写法会被拆成两个参数，
+    现在须写成 ``3,5`` 或加引号的 ``"3 5"``。
+    """
+
+    parts = [part for part in re.split(r"[,\s]+", value.strip()) if part]
+    if len(parts) != 2:
+        raise typer.BadParameter(f"范围参数必须包含两个数值，例如 3,5 或加引号的 \"3 5\"：{value}")
+    try:
+        low, high = cast(parts[0]), cast(parts[1])
+    except ValueError as exc:
+        raise typer.BadParameter(f"无法解析范围参数：{value}") from exc
     if low > high:
         low, high = high, low
     return low, high
 
 
-def _build_progress_callback(progress: Progress):
+def _build_progress_callback(progress: Progress, interval: float = PROGRESS_REFRESH_INTERVAL):
+    """构建按时间间隔合并刷新的进度回调，最后一次更新总会立即刷新。"""
+
     task_id: Optional[int] = None
+    last_ts = 0.0
 
     def callback(update: ProgressUpdate) -> None:
-        nonlocal task_id
+        nonlocal task_id, last_ts
         if update.total == 0:
             return
         if task_id is None:
             task_id = progress.add_task("处理图片", total=update.total)
-        progress.update(task_id, completed=update.completed)
-        if update.message:
+
+        # 消息级事件（跳过、失败等）总是输出；计数事件按时间间隔合并。
+        if update.level >= PROGRESS_LEVEL_MESSAGE and update.message:
             progress.log(update.message)
 
+        now = time.monotonic()
+        if now - last_ts < interval and update.completed < update.total:
+            return
+        last_ts = now
+        progress.update(task_id, completed=update.completed)
+
     return callback
 
 
@@ -89,33 +118,46 @@ def run_cli(  # noqa: PLR0913
     rotation_max: float = typer.Option(0.5, "--rotation-max", help="随机旋转最大值"),
     crop_margin: float = typer.Option(0.01, "--crop-margin", help="旋转后放大裁剪比例"),
     watermark_text: Optional[str] = typer.Option(None, "--watermark-text", help="微痕水印文本"),
-    watermark_count: Tuple[int, int] = typer.Option((3, 5), "--watermark-count", help="水印数量范围，默认 3 5"),
-    watermark_opacity: Tuple[float, float] = typer.Option(
-        (0.05, 0.15), "--watermark-opacity", help="水印透明度范围，默认 0.05 0.15"
+    watermark_count: str = typer.Option(
+        "3,5", "--watermark-count", help="水印数量范围，形如 3,5；用空格分隔时需加引号，如 \"3 5\""
+    ),
+    watermark_opacity: str = typer.Option(
+        "0.05,0.15",
+        "--watermark-opacity",
+        help="水印透明度范围，形如 0.05,0.15（空格分隔需加引号）",
     ),
-    watermark_scale: Tuple[float, float] = typer.Option(
-        (0.02, 0.05), "--watermark-scale", help="水印缩放范围，默认 0.02 0.05"
+    watermark_scale: str = typer.Option(
+        "0.02,0.05", "--watermark-scale", help="水印缩放范围，形如 0.02,0.05（空格分隔需加引号）"
     ),
     texture_image: Optional[Path] = typer.Option(None, "--texture-image", help="纹理叠加图片"),
     texture_opacity: float = typer.Option(0.1, "--texture-opacity", help="纹理叠加透明度 0.0~1.0"),
-    max_workers: int = typer.Option(4, "--workers", "-w", help="并发进程数量"),
+    max_workers: Optional[int] = typer.Option(
+        None, "--workers", "-w", help="并发进程数量，默认取 CPU 核数的一半（至少 2）"
+    ),
     allow_recursive: bool = typer.Option(True, "--recursive/--no-recursive", help="是否递归扫描目录"),
     conflict_strategy: str = typer.Option("rename", "--on-conflict", help="文件名冲突策略"),
     random_seed: Optional[int] = typer.Option(None, "--seed", help="随机种子，便于结果复现"),
     auto_validate: bool = typer.Option(False, "--auto-validate", help="处理后立即对比原图计算相似度指标"),
+    max_source_mb: Optional[float] = typer.Option(
+        None, "--max-source-mb", help="单张源图文件大小上限 (MB)，超出时跳过，默认不限制"
+    ),
+    max_source_megapixels: Optional[float] = typer.Option(
+        None, "--max-source-megapixels", help="单张源图像素数上限 (百万像素)，超出时跳过，默认不限制"
+    ),
 ) -> None:
     """执行批量处理。"""
 
     setup_logging()
     logging.getLogger(__name__).debug("CLI 参数解析完成")
 
-    sources = [p.expanduser().resolve() for p in source]
+    # 源路径的 expanduser/resolve 推迟到扫描阶段按需执行。
+    sources = tuple(source)
     output_dir = output.expanduser().resolve()
 
     ratio_w, ratio_h = _parse_ratio(ratio)
-    wm_count = _parse_count_range(watermark_count)
-    wm_opacity = _parse_count_range(watermark_opacity)
-    wm_scale = _parse_count_range(watermark_scale)
+    wm_count = _parse_pair(watermark_count, int)
+    wm_opacity = _parse_pair(watermark_opacity, float)
+    wm_scale = _parse_pair(watermark_scale, float)
 
     styling = StylingConfig(
         aspect_ratio=(ratio_w, ratio_h),
@@ -158,8 +200,12 @@ def run_cli(  # noqa: PLR0913
         anti_dedup=anti_dedup,
         validation=ValidationConfig(enabled=auto_validate),
         allow_recursive=allow_recursive,
-        max_workers=max_workers,
+        max_workers=default_worker_count() if max_workers is None else max_workers,
         random_seed=random_seed,
+        max_source_bytes=None if max_source_mb is None else int(max_source_mb * 1024 * 1024),
+        max_source_pixels=(
+            None if max_source_megapixels is None else int(max_source_megapixels * 1_000_000)
+        ),
     )
 
     progress = Progress(
@@ -168,6 +214,7 @@ def run_cli(  # noqa: PLR0913
         BarColumn(),
         TimeElapsedColumn(),
         TimeRemainingColumn(),
+        refresh_per_second=10,
     )
 
     with progress:
@@ -2,14 +2,28 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import os
+import re
+from dataclasses import dataclass, field, fields
+from fnmatch import translate
 from pathlib import Path
 from typing import Optional, Sequence, Tuple
 
 AntiDedupMode = str  # 未来可替换为 Enum，但此阶段使用简单别名。
 
+DEFAULT_INCLUDE_PATTERNS: Tuple[str, ...] = ("*.jpg", "*.jpeg", "*.png")
 
-@dataclass(slots=True)
+
+def default_worker_count() -> int:
+    """默认并发进程数：CPU 核数的一半，至少 2 个。
+
+    每个工作进程同时持有多张整幅图像，按全部核数并发容易在大图批次中耗尽内存。
+    """
+
+    return max(2, (os.cpu_count() or 2) // 2)
+
+
+@dataclass(frozen=True, slots=True)
 class WatermarkConfig:
     """微痕水印相关配置。"""
 
@@ -21,7 +35,7 @@ class WatermarkConfig:
     scale_range: Tuple[float, float] = (0.02, 0.05)
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class AntiDedupConfig:
     """防重复检测相关配置。"""
 
@@ -35,7 +49,7 @@ class AntiDedupConfig:
     texture: "TextureConfig" = field(default_factory=lambda: TextureConfig(enabled=False))
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class StylingConfig:
     """风格化与尺寸配置。"""
 
@@ -48,7 +62,7 @@ class StylingConfig:
     border_thickness: int = 0
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class OutputConfig:
     """输出目录与冲突策略配置。"""
 
@@ -57,14 +71,14 @@ class OutputConfig:
     flatten_structure: bool = True
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class ValidationConfig:
     """自动验证相关配置。"""
 
     enabled: bool = False
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class TextureConfig:
     """纹理叠加配置。"""
 
@@ -73,7 +87,7 @@ class TextureConfig:
     opacity: float = 0.1
 
 
-@dataclass(slots=True)
+@dataclass(frozen=True, slots=True)
 class JobConfig:
     """单次批处理任务的配置集合。"""
 
@@ -83,8 +97,55 @@ class JobConfig:
     anti_dedup: AntiDedupConfig
     validation: ValidationConfig = field(default_factory=ValidationConfig)
     allow_recursive: bool = True
-    include_patterns: Sequence[str] = field(default_factory=lambda: ("*.jpg", "*.jpeg", "*.png"))
+    include_patterns: Sequence[str] = DEFAULT_INCLUDE_PATTERNS
     exclude_patterns: Sequence[str] = field(default_factory=tuple)
-    max_workers: int = 4
+    max_workers: int = field(default_factory=default_worker_count)
     random_seed: Optional[int] = None
     report_filename: str = "report.csv"
+    # 单张源图的上限：文件字节数与解码像素数，超出时跳过不解码；None 表示不限制。
+    max_source_bytes: Optional[int] = None
+    max_source_pixels: Optional[int] = None
+    # 由 include/exclude_patterns 预编译的正则，扫描阶段直接复用。
+    include_re: "re.Pattern[str]" = field(init=False, repr=False, compare=False)
+    exclude_re: "Optional[re.Pattern[str]]" = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        # 统一转为 tuple，保证冻结后的配置不可变且可哈希。
+        object.__setattr__(self, "sources", tuple(self.sources))
+        object.__setattr__(self, "include_patterns", tuple(self.include_patterns))
+        object.__setattr__(self, "exclude_patterns", tuple(self.exclude_patterns))
+        self._compile_patterns()
+
+    def _compile_patterns(self) -> None:
+        include = _compile_patterns(self.include_patterns or DEFAULT_INCLUDE_PATTERNS)
+        object.__setattr__(self, "include_re", include)
+        object.__setattr__(self, "exclude_re", _compile_patterns(self.exclude_patterns))
+
+    def __reduce__(self):
+        """以基础类型元组序列化，路径以字符串形式传输。"""
+
+        sources = tuple(str(path) for path in self.sources)
+        values = tuple(getattr(self, name) for name in _JOB_CONFIG_FIELDS[1:])
+        return (JobConfig._rebuild, (sources, *values))
+
+    @classmethod
+    def _rebuild(cls, sources: Tuple[str, ...], *values: object) -> "JobConfig":
+        """反序列化入口：跳过 __init__ 校验，直接恢复字段。"""
+
+        instance = cls.__new__(cls)
+        object.__setattr__(instance, "sources", tuple(Path(path) for path in sources))
+        for name, value in zip(_JOB_CONFIG_FIELDS[1:], values):
+            object.__setattr__(instance, name, value)
+        instance._compile_patterns()
+        return instance
+
+
+def _compile_patterns(patterns: Sequence[str]) -> Optional[re.Pattern[str]]:
+    """将多个通配符（不区分大小写）合并为一个正则，匹配时只需一次 match 调用。"""
+
+    if not patterns:
+        return None
+    return re.compile("|".join(translate(pattern.lower()) for pattern in patterns))
+
+
+_JOB_CONFIG_FIELDS = tuple(f.name for f in fields(JobConfig) if f.init)
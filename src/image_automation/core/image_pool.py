@@ -0,0 +1,82 @@
+"""按 (mode, size) 复用 PIL 图像缓冲区的对象池。"""
+
+from __future__ import annotations
+
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from PIL import Image
+
+PoolKey = Tuple[str, Tuple[int, int]]
+
+DEFAULT_MAX_PER_KEY = 4
+
+
+class ImageBufferPool:
+    """进程内的图像缓冲池。
+
+    批处理中的输出尺寸通常一致，复用画布可以避免每张图片都重新分配大块内存。
+    只有通过 ``acquire`` 取得的图像会被回收，其余图像在 ``release`` 时直接关闭。
+    """
+
+    def __init__(self, max_per_key: int = DEFAULT_MAX_PER_KEY) -> None:
+        self._max_per_key = max_per_key
+        self._free: Dict[PoolKey, Deque[Image.Image]] = defaultdict(deque)
+        self._free_ids: set[int] = set()
+        # 弱引用记录已借出的缓冲区，未归还的图像仍可被正常回收。
+        self._issued: WeakValueDictionary[int, Image.Image] = WeakValueDictionary()
+
+    def acquire(self, mode: str, size: Tuple[int, int], fill: Optional[object] = None) -> Image.Image:
+        """取得指定模式与尺寸的图像；提供 ``fill`` 时会先用该颜色填满。"""
+
+        bucket = self._free.get((mode, size))
+        if bucket:
+            image = bucket.pop()
+            self._free_ids.discard(id(image))
+            if fill is not None:
+                image.paste(fill, (0, 0, size[0], size[1]))
+        else:
+            image = Image.new(mode, size, fill if fill is not None else 0)
+        self._issued[id(image)] = image
+        return image
+
+    def release(self, image: Optional[Image.Image]) -> None:
+        """归还图像；非池内图像或池已满时直接关闭。"""
+
+        if image is None or id(image) in self._free_ids:
+            return
+
+        if self._issued.get(id(image)) is image:
+            del self._issued[id(image)]
+            bucket = self._free[(image.mode, image.size)]
+            if len(bucket) < self._max_per_key:
+                bucket.append(image)
+                self._free_ids.add(id(image))
+                return
+
+        image.close()
+
+    def clear(self) -> None:
+        """关闭并清空所有空闲缓冲区。"""
+
+        for bucket in self._free.values():
+            while bucket:
+                bucket.pop().close()
+        self._free.clear()
+        self._free_ids.clear()
+
+
+_DEFAULT_POOL = ImageBufferPool()
+
+
+def acquire(mode: str, size: Tuple[int, int], fill: Optional[object] = None) -> Image.Image:
+    """从当前进程的默认池中取得图像缓冲区。"""
+
+    return _DEFAULT_POOL.acquire(mode, size, fill)
+
+
+def release(image: Optional[Image.Image]) -> None:
+    """将图像归还到当前进程的默认池。"""
+
+    _DEFAULT_POOL.release(image)
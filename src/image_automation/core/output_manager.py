@@ -3,10 +3,14 @@
 from __future__ import annotations
 
 import logging
+import os
+import re
+import unicodedata
 from dataclasses import dataclass
 from itertools import count
 from pathlib import Path
-from typing import Optional, Set
+from types import MappingProxyType
+from typing import Dict, Mapping, Optional, Set, Tuple
 
 from PIL import Image
 
@@ -16,17 +20,44 @@ from image_automation.core.models import SourceImage
 
 LOGGER = logging.getLogger(__name__)
 
-SUPPORTED_FORMATS = {
-    ".jpg": "JPEG",
-    ".jpeg": "JPEG",
-    ".png": "PNG",
-}
+SUPPORTED_FORMATS: Mapping[str, str] = MappingProxyType(
+    {
+        ".jpg": "JPEG",
+        ".jpeg": "JPEG",
+        ".png": "PNG",
+    }
+)
 
 
 class ImageWriteError(ImageAutomationError):
     """输出写入失败。"""
 
 
+@dataclass(frozen=True, slots=True)
+class SaveRecipe:
+    """预先解析好的保存参数：格式、保存参数与允许直接写入的色彩模式。"""
+
+    image_format: str
+    params: dict
+    allowed_modes: frozenset[str]
+    fallback_mode: str = "RGB"
+
+
+def _build_save_recipes() -> dict[str, SaveRecipe]:
+    recipes: dict[str, SaveRecipe] = {}
+    for suffix, image_format in SUPPORTED_FORMATS.items():
+        if image_format == "JPEG":
+            recipes[suffix] = SaveRecipe(
+                image_format, {"optimize": True, "quality": 95, "subsampling": 1}, frozenset({"RGB"})
+            )
+        else:
+            recipes[suffix] = SaveRecipe(image_format, {"optimize": True}, frozenset({"RGB", "RGBA"}))
+    return recipes
+
+
+SAVE_RECIPES = _build_save_recipes()
+
+
 @dataclass(slots=True)
 class DestinationDecision:
     """封装输出文件决策。"""
@@ -43,6 +74,14 @@ class OutputManager:
         self.config = config
         self.output_dir = config.output_dir.resolve()
         self.output_dir.mkdir(parents=True, exist_ok=True)
+        self._recipes = SAVE_RECIPES
+        self._rename_indices: Dict[Tuple[Path, str, str], int] = {}
+        self._ensured_dirs: Set[Path] = {self.output_dir}
+        # 每个输出目录只 scandir 一次，之后的存在性判断在内存中完成。
+        self._dir_names: Dict[Path, Set[str]] = {}
+        self._logger = LOGGER
+        # 逐图调试日志只在启用 DEBUG 时格式化。
+        self._debug = LOGGER.isEnabledFor(logging.DEBUG)
 
     def decide_destination(self, source: SourceImage, reserved_paths: Optional[Set[Path]] = None) -> DestinationDecision:
         """根据冲突策略确定输出路径。
@@ -50,7 +89,8 @@ class OutputManager:
         `reserved_paths` 用于并发场景下预留尚未写入的目标文件，避免重名。
         """
 
-        reserved_paths = reserved_paths or set()
+        if reserved_paths is None:
+            reserved_paths = set()
 
         if self.config.flatten_structure:
             relative = Path(source.source_path.name)
@@ -58,9 +98,12 @@ class OutputManager:
             relative = source.relative_path
 
         destination = self.output_dir / relative
-        destination.parent.mkdir(parents=True, exist_ok=True)
+        parent = destination.parent
+        if parent not in self._ensured_dirs:
+            parent.mkdir(parents=True, exist_ok=True)
+            self._ensured_dirs.add(parent)
 
-        if destination not in reserved_paths and not destination.exists():
+        if destination not in reserved_paths and not self._exists(destination):
             reserved_paths.add(destination)
             return DestinationDecision(destination=destination, action="write")
 
@@ -75,6 +118,8 @@ class OutputManager:
         if strategy == "rename":
             new_destination = self._generate_renamed_path(destination, reserved_paths)
             reserved_paths.add(new_destination)
+            if self._debug:
+                self._logger.debug("输出重命名: %s -> %s", destination, new_destination)
             return DestinationDecision(
                 destination=new_destination,
                 action="rename",
@@ -86,43 +131,92 @@ class OutputManager:
     def save_image(self, image: Image.Image, destination: Path) -> None:
         """将 PIL Image 保存到磁盘。"""
 
-        save_image_file(image, destination)
+        save_image_file(image, destination, recipes=self._recipes)
+
+    def _exists(self, destination: Path) -> bool:
+        """借助目录清单判断目标是否存在；清单命中时再 stat 确认，兼容大小写不敏感的文件系统。"""
+
+        parent = destination.parent
+        names = self._dir_names.get(parent)
+        if names is None:
+            try:
+                names = _list_name_keys(parent)
+            except OSError:
+                return destination.exists()
+            self._dir_names[parent] = names
+        if _name_key(destination.name) not in names:
+            return False
+        return destination.exists()
 
     def _generate_renamed_path(self, destination: Path, reserved_paths: Set[Path]) -> Path:
         """在 rename 策略下生成新的文件名。"""
 
         stem = destination.stem
         suffix = destination.suffix
-
-        for idx in count(1):
-            candidate = destination.with_name(f"{stem}_{idx}{suffix}")
-            if candidate not in reserved_paths and not candidate.exists():
+        key = (destination.parent, stem, suffix)
+
+        start = self._rename_indices.get(key)
+        if start is None:
+            start = _next_index_for(destination.parent, stem, suffix)
+
+        # 通常首个候选即可用；若遇到意外冲突则继续向后探测。
+        parent_str = os.fspath(destination.parent)
+        for idx in count(start):
+            candidate_str = os.path.join(parent_str, f"{stem}_{idx}{suffix}")
+            if os.path.lexists(candidate_str):
+                continue
+            candidate = Path(candidate_str)
+            if candidate not in reserved_paths:
+                self._rename_indices[key] = idx + 1
                 return candidate
 
         # 理论上不会执行到此处
         return destination
 
 
-def save_image_file(image: Image.Image, destination: Path) -> None:
+def _name_key(name: str) -> str:
+    # 统一 Unicode 组合形式与大小写：macOS 以 NFD 存储文件名，Windows/macOS 默认不区分大小写。
+    return unicodedata.normalize("NFC", name).casefold()
+
+
+def _list_name_keys(directory: Path) -> Set[str]:
+    with os.scandir(directory) as entries:
+        return {_name_key(entry.name) for entry in entries}
+
+
+def _next_index_for(parent: Path, stem: str, suffix: str) -> int:
+    """扫描一次目录，返回 ``stem_N{suffix}`` 形式文件名中最大序号加一。"""
+
+    pattern = re.compile(rf"{re.escape(stem)}_(\d+){re.escape(suffix)}")
+    highest = 0
+    try:
+        with os.scandir(parent) as entries:
+            for entry in entries:
+                match = pattern.fullmatch(entry.name)
+                if match:
+                    highest = max(highest, int(match.group(1)))
+    except OSError:
+        return 1
+    return highest + 1
+
+
+def save_image_file(
+    image: Image.Image, destination: Path, *, recipes: dict[str, SaveRecipe] = SAVE_RECIPES
+) -> None:
     """保存图像到指定路径，在 OutputManager 与并发任务中复用。"""
 
     destination.parent.mkdir(parents=True, exist_ok=True)
     suffix = destination.suffix.lower()
-    image_format = SUPPORTED_FORMATS.get(suffix)
-    if not image_format:
-        raise ImageWriteError(f"不支持的输出格式: {suffix}")
+    try:
+        recipe = recipes[suffix]
+    except KeyError:
+        raise ImageWriteError(f"不支持的输出格式: {suffix}") from None
 
-    save_params = {"optimize": True}
     image_to_save = image
-    if image_format == "JPEG":
-        save_params.update(quality=95, subsampling=1)
-        if image.mode != "RGB":
-            image_to_save = image.convert("RGB")
-    else:
-        if image.mode not in {"RGB", "RGBA"}:
-            image_to_save = image.convert("RGB")
+    if image.mode not in recipe.allowed_modes:
+        image_to_save = image.convert(recipe.fallback_mode)
 
     try:
-        image_to_save.save(destination, format=image_format, **save_params)
+        image_to_save.save(destination, format=recipe.image_format, **recipe.params)
     except OSError as exc:
         raise ImageWriteError(f"写入文件失败: {destination}") from exc
@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
+
+PROGRESS_LEVEL_TICK = 0  # 仅计数推进，不携带消息
+PROGRESS_LEVEL_MESSAGE = 1  # 携带需要展示的消息（跳过、失败、阶段变化等）
 
 
 @dataclass(slots=True)
@@ -14,3 +18,38 @@ class ProgressUpdate:
     completed: int
     message: Optional[str] = None
     status: str = "running"
+    level: int = PROGRESS_LEVEL_TICK
+
+
+class ProgressAggregator:
+    """合并高频的计数事件，按时间间隔向下游回调转发。
+
+    消息级事件与最终完成事件总会立即转发；其余计数事件在间隔内只保留最新一条。
+    """
+
+    def __init__(self, callback: Callable[[ProgressUpdate], None], interval: float = 0.1) -> None:
+        self._callback = callback
+        self._interval = interval
+        self._last_emit = 0.0
+        self._pending: Optional[ProgressUpdate] = None
+
+    def __call__(self, update: ProgressUpdate) -> None:
+        now = time.monotonic()
+        if (
+            update.level >= PROGRESS_LEVEL_MESSAGE
+            or update.completed >= update.total
+            or now - self._last_emit >= self._interval
+        ):
+            self._pending = None
+            self._last_emit = now
+            self._callback(update)
+        else:
+            self._pending = update
+
+    def flush(self) -> None:
+        """转发尚未发送的最新计数事件。"""
+
+        if self._pending is not None:
+            pending, self._pending = self._pending, None
+            self._last_emit = time.monotonic()
+            self._callback(pending)
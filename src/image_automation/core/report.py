@@ -4,32 +4,82 @@ from __future__ import annotations
 
 import csv
 from pathlib import Path
-from typing import Iterable
+from typing import IO, Iterable, Optional
 
 from image_automation.core.models import FileOutcome
 
 HEADER = ["source_path", "output_path", "status", "message", "phash_distance", "ssim"]
 
+REPORT_BUFFER_SIZE = 64 * 1024
+REPORT_FLUSH_EVERY = 256
+
+
+class ReportWriter:
+    """增量写入 CSV 报告：每处理完一项即追加一行，定期刷盘。"""
+
+    def __init__(self, output_dir: Path, filename: str, *, flush_every: int = REPORT_FLUSH_EVERY) -> None:
+        self.report_path = output_dir / filename
+        self._flush_every = max(1, flush_every)
+        self._handle: Optional[IO[str]] = None
+        self._writer = None
+        self._pending = 0
+
+    def __enter__(self) -> "ReportWriter":
+        self.open()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def open(self) -> None:
+        """打开报告文件并写入表头。"""
+
+        self._handle = self.report_path.open("w", newline="", encoding="utf-8", buffering=REPORT_BUFFER_SIZE)
+        self._writer = csv.writer(self._handle)
+        self._writer.writerow(HEADER)
+
+    def write(self, record: FileOutcome) -> None:
+        """追加一条处理结果。"""
+
+        assert self._writer is not None and self._handle is not None, "ReportWriter 尚未打开"
+        self._writer.writerow(_report_row(record))
+        self._pending += 1
+        if self._pending >= self._flush_every:
+            self._handle.flush()
+            self._pending = 0
+
+    def write_many(self, records: Iterable[FileOutcome]) -> None:
+        """批量追加处理结果。"""
+
+        assert self._writer is not None, "ReportWriter 尚未打开"
+        self._writer.writerows(_report_row(record) for record in records)
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+            self._writer = None
+
 
 def write_csv_report(outcomes: Iterable[FileOutcome], output_dir: Path, filename: str) -> Path:
     """将处理结果写入 CSV 报告。"""
 
-    report_path = output_dir / filename
-    with report_path.open("w", newline="", encoding="utf-8") as handle:
-        writer = csv.writer(handle)
-        writer.writerow(HEADER)
-        for record in outcomes:
-            writer.writerow(
-                [
-                    str(record.source_path),
-                    str(record.output_path) if record.output_path else "",
-                    record.status,
-                    record.message or "",
-                    _format_phash(record.phash_distance),
-                    _format_ssim(record.ssim),
-                ]
-            )
-    return report_path
+    with ReportWriter(output_dir, filename) as writer:
+        writer.write_many(outcomes)
+    return writer.report_path
+
+
+def _report_row(record: FileOutcome) -> tuple[str, ...]:
+    """写入时才格式化报告行，始终反映记录的当前字段值。"""
+
+    return (
+        str(record.source_path),
+        str(record.output_path) if record.output_path else "",
+        record.status,
+        record.message or "",
+        _format_phash(record.phash_distance),
+        _format_ssim(record.ssim),
+    )
 
 
 def _format_phash(value: float | None) -> str:
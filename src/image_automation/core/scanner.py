@@ -2,71 +2,100 @@
 
 from __future__ import annotations
 
-from fnmatch import fnmatch
+import os
 from pathlib import Path
-from typing import Iterable, Iterator, Sequence
+from typing import Callable, Iterator
 
-from image_automation.core.config import JobConfig
+from image_automation.core.config import DEFAULT_INCLUDE_PATTERNS, JobConfig
 from image_automation.core.models import SourceImage
 
-IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+IMAGE_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+IMAGE_SUFFIXES = tuple(sorted(IMAGE_EXTENSIONS))  # 供 str.endswith 一次性匹配
 
 
-def _iter_candidate_files(path: Path, recursive: bool) -> Iterator[Path]:
-    """遍历路径下的所有文件。"""
+def _resolve_root(raw: str) -> Path:
+    """展开并解析源路径。
+
+    每次扫描重新解析，不做跨调用缓存：相对路径依赖当前工作目录，GUI 进程中可能随时变化。
+    """
+
+    path = Path(raw)
+    if raw.startswith("~"):
+        path = path.expanduser()
+    return path.resolve()
+
+
+def _iter_candidate_files(path: Path, recursive: bool) -> Iterator[tuple[str, str]]:
+    """遍历路径下的所有文件，返回 (完整路径, 文件名) 字符串。
+
+    使用 os.scandir 复用 DirEntry 缓存的 stat 结果，且不为被过滤的文件构造 Path。
+    """
 
     if path.is_file():
-        yield path
+        yield str(path), path.name
         return
 
     if not path.is_dir():
         return
 
-    iterator = path.rglob("*") if recursive else path.glob("*")
-    for candidate in iterator:
-        if candidate.is_file():
-            yield candidate
+    pending = [str(path)]
+    while pending:
+        directory = pending.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_file():
+                        yield entry.path, entry.name
+                    elif recursive and entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+        except OSError:
+            continue
 
 
-def _matches_any(name: str, patterns: Sequence[str]) -> bool:
-    lowered = name.lower()
-    return any(fnmatch(lowered, pattern.lower()) for pattern in patterns)
+def _has_image_suffix(name: str) -> bool:
+    # 与 Path.suffix 一致：点号必须在首字符之后，名为 ".jpg" 的隐藏文件没有扩展名。
+    return name.endswith(IMAGE_SUFFIXES) and name.rfind(".") > 0
 
 
 def collect_source_images(config: JobConfig) -> list[SourceImage]:
     """根据配置扫描源文件夹，返回匹配的图片列表。"""
 
     collected: list[SourceImage] = []
-    seen_paths: set[Path] = set()
+    seen_paths: set[str] = set()
 
-    include_patterns = config.include_patterns or ("*.jpg", "*.jpeg", "*.png")
-    exclude_patterns = config.exclude_patterns or ()
+    exclude_re = config.exclude_re
+    # 默认通配符等价于扩展名判断：直接使用 str.endswith，且无需再额外检查后缀。
+    check_suffix = tuple(config.include_patterns or DEFAULT_INCLUDE_PATTERNS) != DEFAULT_INCLUDE_PATTERNS
+    include_match: Callable[[str], object] = config.include_re.match if check_suffix else _has_image_suffix
 
     for root in config.sources:
-        resolved_root = root.resolve()
-        for candidate in _iter_candidate_files(resolved_root, config.allow_recursive):
-            if candidate in seen_paths:
+        resolved_root = _resolve_root(str(root))
+        base_dir = resolved_root if resolved_root.is_dir() else resolved_root.parent
+        for candidate_path, candidate_name in _iter_candidate_files(resolved_root, config.allow_recursive):
+            name = candidate_name.lower()
+            if not include_match(name):
                 continue
-            seen_paths.add(candidate)
-
-            name = candidate.name
-            if not _matches_any(name, include_patterns):
+            if exclude_re is not None and exclude_re.match(name):
                 continue
-            if exclude_patterns and _matches_any(name, exclude_patterns):
+
+            if check_suffix and not _has_image_suffix(name):
                 continue
 
-            if candidate.suffix.lower() not in IMAGE_EXTENSIONS:
+            if candidate_path in seen_paths:
                 continue
+            seen_paths.add(candidate_path)
+
+            candidate = Path(candidate_path)
 
             try:
-                relative = candidate.relative_to(resolved_root if resolved_root.is_dir() else resolved_root.parent)
+                relative = candidate.relative_to(base_dir)
             except ValueError:
                 relative = candidate.name
 
             collected.append(
                 SourceImage(
                     source_path=candidate,
-                    root=resolved_root if resolved_root.is_dir() else resolved_root.parent,
+                    root=base_dir,
                     relative_path=Path(relative),
                 )
             )
@@ -3,16 +3,20 @@
 from __future__ import annotations
 
 import logging
+import multiprocessing
 import os
 import queue
 import random
+import re
 import string
 import threading
 import tkinter as tk
+from collections import deque
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path, PureWindowsPath
 from tkinter import filedialog, messagebox, ttk, font as tkfont
-from typing import Callable, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Optional, Tuple
 
 from image_automation.core.config import (
     AntiDedupConfig,
@@ -23,30 +27,163 @@ from image_automation.core.config import (
     ValidationConfig,
     WatermarkConfig,
 )
-from image_automation.core.models import BatchResult
-from image_automation.core.progress import ProgressUpdate
-from image_automation.processing.pipeline import process_batch
-from image_automation.processing.ensure_main_image import ensure_main_image_size
+from image_automation.core.progress import PROGRESS_LEVEL_MESSAGE
 from image_automation.utils.logging import setup_logging
 
+if TYPE_CHECKING:
+    # 处理模块会连带导入 Pillow/numpy/OpenCV，运行时推迟到任务开始时再导入，加快窗口首次绘制。
+    from image_automation.core.models import BatchResult
+    from image_automation.core.progress import ProgressUpdate
+
+
+POLL_INTERVAL_IDLE_MS = 1000
+POLL_INTERVAL_BUSY_MS = 20
+PIPELINE_EVENT = "<<PipelineEvent>>"
+# 运行平台在进程生命周期内不变，导入时判定一次即可。
+_IS_WINDOWS = os.name == "nt"
+LOG_MAX_LINES = 5000
+_RATIO_RE = re.compile(r"^\s*(\d+)\s*:\s*(\d+)\s*$")
+PIPELINE_EVENT_TIMEOUT = 0.5
+# 计数事件队列上限：界面处理不过来时丢弃最旧的计数，内存占用保持恒定。
+EVENT_QUEUE_MAXSIZE = 256
+
+# 定义我们在WSL中安装的字体名称
+_FONT_FAMILY = "WenQuanYi Micro Hei"
+_FONT_SIZE = 10
+_DEFAULT_FONT = (_FONT_FAMILY, _FONT_SIZE)
+_STYLE_FONTS: Tuple[Tuple[str, Tuple[Any, ...]], ...] = (
+    ("TButton", _DEFAULT_FONT),
+    ("TLabel", _DEFAULT_FONT),
+    ("TEntry", _DEFAULT_FONT),
+    ("TLabelFrame", _DEFAULT_FONT),
+    ("TLabelFrame.Label", (_FONT_FAMILY, _FONT_SIZE, "bold")),  # 标题加粗
+    ("TCombobox", _DEFAULT_FONT),
+    ("TCheckbutton", _DEFAULT_FONT),
+)
+_FONTS_CONFIGURED_VAR = "::image_automation_fonts_configured"
+POLL_MAX_EVENTS = 200
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders ``asctime`` once per wall-clock second."""
+
+    def __init__(self, fmt: str, datefmt: str) -> None:
+        super().__init__(fmt, datefmt=datefmt)
+        self._cached_second = -1
+        self._cached_asctime = ""
+
+    def formatTime(self, record: logging.LogRecord, datefmt: Optional[str] = None) -> str:  # noqa: N802
+        second = int(record.created)
+        if second != self._cached_second:
+            self._cached_asctime = super().formatTime(record, datefmt)
+            self._cached_second = second
+        return self._cached_asctime
+
+
+_GUI_FORMATTER = _CachedTimeFormatter("%(asctime)s %(levelname)s: %(message)s", datefmt="%H:%M:%S")
+
+
+@lru_cache(maxsize=256)
+def _parse_platform_path(candidate: str, is_windows: bool) -> Path:
+    """将路径字符串转换为当前平台的 Path（WSL 下把 C:\\ 形式映射到 /mnt/c）。"""
+
+    if not is_windows and len(candidate) >= 2 and candidate[1] == ":":
+        win_path = PureWindowsPath(candidate)
+        drive = win_path.drive.rstrip(":").lower()
+        # PureWindowsPath.parts 包含 drive，自第二个元素起为层级路径
+        return Path("/mnt", drive, *win_path.parts[1:]).expanduser()
+
+    return Path(candidate).expanduser()
+
+
+@lru_cache(maxsize=256)
+def _resolve_absolute_path(candidate: str, is_windows: bool) -> Path:
+    """缓存绝对路径的 resolve() 结果，避免同一路径反复触发 stat/readlink。"""
+
+    return _parse_platform_path(candidate, is_windows).resolve()
+
+
+_PIPELINE_EVENTS: Optional[Any] = None
+
+
+def _forward_pipeline_progress(update: ProgressUpdate) -> None:
+    _PIPELINE_EVENTS.put(("progress", update))
+
+
+def _run_pipeline_process(job: JobConfig, events: Any) -> None:
+    """子进程入口：执行批处理，结果与异常都经事件队列回传，保证排在进度事件之后。"""
+
+    global _PIPELINE_EVENTS
+    _PIPELINE_EVENTS = events
+
+    from image_automation.processing.pipeline import process_batch, shutdown_worker_pool
+
+    try:
+        result = process_batch(job, progress_callback=_forward_pipeline_progress)
+    except Exception as exc:  # noqa: BLE001
+        events.put(("error", str(exc)))
+    else:
+        events.put(("done", result))
+    finally:
+        # multiprocessing 子进程退出时不会关闭共享进程池，需显式关闭以免子进程挂起。
+        shutdown_worker_pool()
+
+
+def _trim_text_widget(widget: tk.Text, max_lines: int = LOG_MAX_LINES) -> None:
+    """删除超出上限的最早日志行，避免长时间任务中 Text 控件无限增长。
+
+    调用方需保证控件处于 NORMAL 状态。
+    """
+
+    lines = int(widget.index("end-1c").split(".", 1)[0])
+    if lines > max_lines:
+        widget.delete("1.0", f"{lines - max_lines + 1}.0")
+
 
 class TextWidgetHandler(logging.Handler):
-    """Logging handler that writes records into a Tk Text widget."""
+    """Logging handler that writes records into a Tk Text widget.
+
+    Records are buffered and flushed in one batch per idle tick, so bursts of
+    log output cost a single widget update instead of one per record.
+    """
 
     def __init__(self, widget: tk.Text) -> None:
         super().__init__()
         self._widget = widget
+        # 通过 <Destroy> 事件在 Python 侧记录控件存活状态，避免每次写入都调用 winfo_exists。
+        self._alive = True
+        widget.bind("<Destroy>", self._handle_destroy, add="+")
+        self._pending: Deque[str] = deque()
+        self._pending_lock = threading.Lock()
+        self._flush_scheduled = False
 
     def emit(self, record: logging.LogRecord) -> None:  # noqa: D401 - standard logging handler signature
         message = self.format(record)
+        with self._pending_lock:
+            self._pending.append(message + "\n")
+            if self._flush_scheduled:
+                return
+            self._flush_scheduled = True
         # Schedule UI update on main thread
-        self._widget.after(0, self._write, message)
+        self._widget.after_idle(self._flush)
+
+    def _flush(self) -> None:
+        with self._pending_lock:
+            batch, self._pending = self._pending, deque()
+            self._flush_scheduled = False
+        if batch:
+            self._write("".join(batch))
+
+    def _handle_destroy(self, event: tk.Event) -> None:
+        if event.widget is self._widget:
+            self._alive = False
 
-    def _write(self, message: str) -> None:
-        if not self._widget.winfo_exists():
+    def _write(self, text: str) -> None:
+        if not self._alive:
             return
         self._widget.configure(state=tk.NORMAL)
-        self._widget.insert(tk.END, message + "\n")
+        self._widget.insert(tk.END, text)
+        _trim_text_widget(self._widget)
         self._widget.configure(state=tk.DISABLED)
         self._widget.see(tk.END)
 
@@ -113,8 +250,7 @@ class MainImageToolWindow(AuxToolWindow):
         self._logger.setLevel(logging.INFO)
         self._logger.propagate = False
         self._log_handler = TextWidgetHandler(self.log_text)
-        formatter = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
-        self._log_handler.setFormatter(formatter)
+        self._log_handler.setFormatter(_GUI_FORMATTER)
         self._logger.addHandler(self._log_handler)
 
     def _build_widgets(self) -> None:
@@ -212,19 +348,37 @@ class MainImageToolWindow(AuxToolWindow):
         else:
             self._logger.info("敏感词检测已关闭，将仅执行尺寸检查。")
 
+        max_workers = self._resolve_worker_count()
+        self._logger.info("并行线程数: %s", max_workers)
+
+        # 后台线程运行整个任务，各子目录在 ensure_main_image_size 的线程池中处理：解码、缩放与编码
+        # 在释放 GIL 的 OpenCV/Pillow C 代码中执行，OCR 交给 tesseract，Tk 主线程保持响应。
         self._worker_thread = threading.Thread(
             target=self._run_task,
-            args=(directory, forbidden_terms if forbidden_enabled else []),
+            args=(directory, forbidden_terms if forbidden_enabled else [], max_workers),
             daemon=True,
         )
         self._worker_thread.start()
 
-    def _run_task(self, directory: Path, forbidden_terms: list[str]) -> None:
+    def _resolve_worker_count(self) -> int:
+        # 复用主窗口的“进程数”设置，但每个目录线程还会启动 OCR 预处理线程与 tesseract 进程，
+        # 因此线程数不超过 CPU 核数。
+        cpu_count = os.cpu_count() or 1
+        try:
+            requested = int(self._parent_app.worker_var.get())
+        except (tk.TclError, ValueError):
+            return cpu_count
+        return max(1, min(requested, cpu_count))
+
+    def _run_task(self, directory: Path, forbidden_terms: list[str], max_workers: int) -> None:
+        from image_automation.processing.ensure_main_image import ensure_main_image_size
+
         try:
             stats = ensure_main_image_size(
                 directory,
                 logger=self._logger,
                 forbidden_terms=forbidden_terms or None,
+                max_workers=max_workers,
             )
             summary = (
                 f"完成: 共{stats.total_folders}个子目录，检查{stats.inspected_files}张，"
@@ -274,58 +428,167 @@ class MainImageToolWindow(AuxToolWindow):
 class ImageAutomationApp(tk.Tk):
     """Tkinter 主窗口。"""
 
+    _ASCII_UPPER = string.ascii_uppercase
+
+    # 以下 Tk 变量由 _OPTION_SPEC 在 _build_options_section 中统一创建，这里显式声明类型。
+    ratio_var: tk.StringVar
+    min_width_var: tk.IntVar
+    min_height_var: tk.IntVar
+    mode_var: tk.StringVar
+    bg_color_var: tk.StringVar
+    border_color_var: tk.StringVar
+    border_thickness_var: tk.IntVar
+    border_image_var: tk.StringVar
+    antidedup_mode_var: tk.StringVar
+    allow_mirror_var: tk.BooleanVar
+    noise_var: tk.DoubleVar
+    color_var: tk.DoubleVar
+    rot_min_var: tk.DoubleVar
+    rot_max_var: tk.DoubleVar
+    crop_var: tk.DoubleVar
+    watermark_text_var: tk.StringVar
+    random_watermark_var: tk.BooleanVar
+    watermark_min_var: tk.IntVar
+    watermark_max_var: tk.IntVar
+    watermark_opacity_min_var: tk.DoubleVar
+    watermark_opacity_max_var: tk.DoubleVar
+    watermark_scale_min_var: tk.DoubleVar
+    watermark_scale_max_var: tk.DoubleVar
+    worker_var: tk.IntVar
+    seed_var: tk.StringVar
+    texture_enabled_var: tk.BooleanVar
+    texture_path_var: tk.StringVar
+    texture_opacity_var: tk.DoubleVar
+    validation_var: tk.BooleanVar
+
+    # 处理选项对应的 Tk 变量：(属性名, 变量类型, 默认值)
+    _OPTION_SPEC: Tuple[Tuple[str, type, Any], ...] = (
+        ("ratio_var", tk.StringVar, "1:1"),
+        ("min_width_var", tk.IntVar, 800),
+        ("min_height_var", tk.IntVar, 800),
+        ("mode_var", tk.StringVar, "contain"),
+        ("bg_color_var", tk.StringVar, "#000000"),
+        ("border_color_var", tk.StringVar, ""),
+        ("border_thickness_var", tk.IntVar, 0),
+        ("border_image_var", tk.StringVar, ""),
+        ("antidedup_mode_var", tk.StringVar, "heavy"),
+        ("allow_mirror_var", tk.BooleanVar, False),
+        ("noise_var", tk.DoubleVar, 0.025),
+        ("color_var", tk.DoubleVar, 0.08),
+        ("rot_min_var", tk.DoubleVar, -0.5),
+        ("rot_max_var", tk.DoubleVar, 0.5),
+        ("crop_var", tk.DoubleVar, 0.05),
+        ("watermark_text_var", tk.StringVar, ""),
+        ("random_watermark_var", tk.BooleanVar, False),
+        ("watermark_min_var", tk.IntVar, 15),
+        ("watermark_max_var", tk.IntVar, 25),
+        ("watermark_opacity_min_var", tk.DoubleVar, 0.05),
+        ("watermark_opacity_max_var", tk.DoubleVar, 0.10),
+        ("watermark_scale_min_var", tk.DoubleVar, 0.02),
+        ("watermark_scale_max_var", tk.DoubleVar, 0.05),
+        ("worker_var", tk.IntVar, 8),
+        ("seed_var", tk.StringVar, ""),
+        ("texture_enabled_var", tk.BooleanVar, False),
+        ("texture_path_var", tk.StringVar, ""),
+        ("texture_opacity_var", tk.DoubleVar, 0.1),
+        ("validation_var", tk.BooleanVar, False),
+    )
+
     def __init__(self) -> None:
         super().__init__()
         self.title("Image Automation Tool")
         self.geometry("900x600")
-        self._configure_fonts()
-        setup_logging()
         self.default_dir = self._determine_default_dir()
-        self.default_dir.mkdir(parents=True, exist_ok=True)
 
         self.sources: List[Path] = []
+        self._source_set: set[Path] = set()
         self.output_dir: Optional[Path] = self.default_dir
         self._worker_thread: Optional[threading.Thread] = None
-        self._event_queue: queue.Queue = queue.Queue()
+        # 纯计数事件只需最新值，使用有界队列；带消息的进度（跳过、失败等）与完成/异常事件
+        # 各走独立的无界队列，永不丢弃。
+        self._event_queue: queue.Queue = queue.Queue(maxsize=EVENT_QUEUE_MAXSIZE)
+        self._message_queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._terminal_queue: queue.SimpleQueue = queue.SimpleQueue()
         self._progress_total = 0
+        self._progress_percent = 0
+        self._poll_interval = POLL_INTERVAL_IDLE_MS
+        self._wakeup_pending = False
+        # POSIX 下使用自管道唤醒主循环：(读端, 写端)；None 表示退回虚拟事件唤醒。
+        self._wakeup_pipe: Optional[Tuple[int, int]] = None
         self._auxiliary_tools: Dict[str, AuxToolDescriptor] = {}
         self._aux_tool_order: List[str] = []
         self._aux_tool_label_map: Dict[str, str] = {}
         self._aux_tool_selector_var: Optional[tk.StringVar] = None
         self._open_tool_windows: Dict[str, AuxToolWindow] = {}
+        # 构建配置时需要读取的 Tk 变量（键为去掉 _var 后缀的属性名），在 _build_ui 中登记
+        self._option_vars: Dict[str, tk.Variable] = {}
         self._register_auxiliary_tools()
 
+        # 字体、日志与控件构建放到首个空闲时刻，让窗口先完成绘制。
+        self.after_idle(self._late_init)
+
+    def _late_init(self) -> None:
+        """在主循环启动后完成其余初始化。"""
+
+        self._configure_fonts()
+        setup_logging()
+        self.default_dir.mkdir(parents=True, exist_ok=True)
         self._build_ui()
-        self.after(200, self._poll_queue)
+        self.bind(PIPELINE_EVENT, lambda _event: self._drain_queue())
+        self._install_wakeup_pipe()
+        self.after(self._poll_interval, self._poll_queue)
+
+    def _install_wakeup_pipe(self) -> None:
+        """在支持 createfilehandler 的平台上注册自管道，工作线程写入即可唤醒主循环。"""
+
+        if _IS_WINDOWS or not hasattr(self.tk, "createfilehandler"):
+            return
+        read_fd, write_fd = os.pipe()
+        os.set_blocking(read_fd, False)
+        os.set_blocking(write_fd, False)
+        self.tk.createfilehandler(read_fd, tk.READABLE, self._handle_wakeup_pipe)
+        self._wakeup_pipe = (read_fd, write_fd)
+
+    def _handle_wakeup_pipe(self, read_fd: int, _mask: int) -> None:
+        try:
+            while os.read(read_fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+        self._drain_queue()
+
+    def destroy(self) -> None:
+        if self._wakeup_pipe is not None:
+            read_fd, write_fd = self._wakeup_pipe
+            self._wakeup_pipe = None
+            self.tk.deletefilehandler(read_fd)
+            os.close(read_fd)
+            os.close(write_fd)
+        super().destroy()
 
     def _configure_fonts(self) -> None:
-        """设置全局字体以支持中文。"""
-        # 定义我们刚刚在WSL中安装的字体名称
-        font_family = "WenQuanYi Micro Hei"
-        font_size = 10
+        """设置全局字体以支持中文。
+
+        样式与选项数据库属于 Tcl 解释器，同一解释器只需配置一次；
+        以 Tcl 全局变量作为标记，新建的 Tk 根窗口仍会重新配置。
+        """
+
+        if self.tk.call("info", "exists", _FONTS_CONFIGURED_VAR):
+            return
 
-        # 获取样式对象
+        # 获取样式对象，为常见的控件类型配置默认字体
         style = ttk.Style(self)
+        for style_name, font_spec in _STYLE_FONTS:
+            style.configure(style_name, font=font_spec)
 
-        # 为常见的控件类型配置默认字体
-        # 您可以根据需要添加更多控件，如 "TNotebook.Tab" 等
-        style.configure("TButton", font=(font_family, font_size))
-        style.configure("TLabel", font=(font_family, font_size))
-        style.configure("TEntry", font=(font_family, font_size))
-        style.configure("TLabelFrame", font=(font_family, font_size))
-        style.configure("TLabelFrame.Label", font=(font_family, font_size, "bold")) # 标题加粗
-        style.configure("TCombobox", font=(font_family, font_size))
-        style.configure("TCheckbutton", font=(font_family, font_size))
-
-        # 对于非ttk的经典控件，可能需要单独设置
-        # 比如您的 tk.Listbox 和 tk.Text
-        # 可以在创建它们时直接指定字体
-        self.option_add("*Font", (font_family, font_size))
+        # 对于非ttk的经典控件（如 tk.Listbox 和 tk.Text），通过选项数据库设置
+        self.option_add("*Font", _DEFAULT_FONT)
+        self.tk.setvar(_FONTS_CONFIGURED_VAR, 1)
 
     def _determine_default_dir(self) -> Path:
         """根据运行平台计算默认目录。"""
 
-        if os.name == "nt":
+        if _IS_WINDOWS:
             return Path(r"C:\Users\hewqb\Desktop")
         return Path("/mnt/c/Users/hewqb/Desktop")
 
@@ -336,17 +599,12 @@ class ImageAutomationApp(tk.Tk):
         if not candidate:
             raise ValueError("路径不能为空")
 
-        if os.name == "nt":
-            return Path(candidate).expanduser().resolve()
-
-        if len(candidate) >= 2 and candidate[1] == ":":
-            win_path = PureWindowsPath(candidate)
-            drive = win_path.drive.rstrip(":").lower()
-            # PureWindowsPath.parts 包含 drive，自第二个元素起为层级路径
-            converted = Path("/mnt", drive, *win_path.parts[1:])
-            return converted.expanduser().resolve()
-
-        return Path(candidate).expanduser().resolve()
+        parsed = _parse_platform_path(candidate, _IS_WINDOWS)
+        if parsed.is_absolute():
+            # 始终 resolve()：符号链接别名需规范化为同一路径，_source_set 才能去重。
+            return _resolve_absolute_path(candidate, _IS_WINDOWS)
+        # 相对路径依赖当前工作目录，不能缓存。
+        return parsed.resolve()
 
     # ---------------------- 辅助工具管理 ---------------------- #
 
@@ -365,8 +623,13 @@ class ImageAutomationApp(tk.Tk):
         )
 
     def _add_aux_tool(self, descriptor: AuxToolDescriptor) -> None:
+        existing = self._aux_tool_label_map.get(descriptor.label)
+        if existing is not None and existing != descriptor.tool_id:
+            raise ValueError(f"辅助工具名称重复: {descriptor.label}")
+        if descriptor.tool_id not in self._auxiliary_tools:
+            self._aux_tool_order.append(descriptor.tool_id)
         self._auxiliary_tools[descriptor.tool_id] = descriptor
-        self._aux_tool_order.append(descriptor.tool_id)
+        self._aux_tool_label_map[descriptor.label] = descriptor.tool_id
 
     def _handle_tool_window_closed(self, tool_id: str) -> None:
         self._open_tool_windows.pop(tool_id, None)
@@ -408,6 +671,9 @@ class ImageAutomationApp(tk.Tk):
         self._build_aux_tools_section(container)
         self._build_progress_section(container)
 
+        self._option_vars["conflict"] = self.conflict_var
+        self._option_vars["recursive"] = self.recursive_var
+
     def _build_source_section(self, parent: tk.Widget) -> None:
         frame = ttk.LabelFrame(parent, text="源目录", padding=8)
         frame.pack(fill=tk.X, expand=False)
@@ -444,115 +710,91 @@ class ImageAutomationApp(tk.Tk):
         frame = ttk.LabelFrame(parent, text="处理选项", padding=8)
         frame.pack(fill=tk.BOTH, expand=False)
 
+        for name, var_cls, default in self._OPTION_SPEC:
+            var = var_cls(self, value=default)
+            setattr(self, name, var)
+            self._option_vars[name.removesuffix("_var")] = var
+
         # Styling
         ttk.Label(frame, text="比例 (W:H):").grid(row=0, column=0, sticky=tk.W)
-        self.ratio_var = tk.StringVar(value="1:1")
         ttk.Entry(frame, textvariable=self.ratio_var, width=8).grid(row=0, column=1, sticky=tk.W)
 
         ttk.Label(frame, text="最小尺寸:").grid(row=0, column=2, sticky=tk.W)
-        self.min_width_var = tk.IntVar(value=800)
-        self.min_height_var = tk.IntVar(value=800)
         ttk.Entry(frame, textvariable=self.min_width_var, width=6).grid(row=0, column=3, sticky=tk.W)
         ttk.Entry(frame, textvariable=self.min_height_var, width=6).grid(row=0, column=4, sticky=tk.W, padx=(4, 0))
 
         ttk.Label(frame, text="适配模式:").grid(row=0, column=5, sticky=tk.W)
-        self.mode_var = tk.StringVar(value="contain")
         ttk.Combobox(frame, textvariable=self.mode_var, values=("contain", "cover"), width=10).grid(
             row=0, column=6, sticky=tk.W
         )
 
         ttk.Label(frame, text="背景色:").grid(row=1, column=0, sticky=tk.W, pady=4)
-        self.bg_color_var = tk.StringVar(value="#000000")
         ttk.Entry(frame, textvariable=self.bg_color_var, width=10).grid(row=1, column=1, sticky=tk.W)
 
         ttk.Label(frame, text="边框颜色:").grid(row=1, column=2, sticky=tk.W)
-        self.border_color_var = tk.StringVar()
         ttk.Entry(frame, textvariable=self.border_color_var, width=10).grid(row=1, column=3, sticky=tk.W)
 
         ttk.Label(frame, text="边框厚度:").grid(row=1, column=4, sticky=tk.W)
-        self.border_thickness_var = tk.IntVar(value=0)
         ttk.Entry(frame, textvariable=self.border_thickness_var, width=6).grid(row=1, column=5, sticky=tk.W)
 
         ttk.Label(frame, text="边框模板:").grid(row=1, column=6, sticky=tk.W)
-        self.border_image_var = tk.StringVar()
         ttk.Entry(frame, textvariable=self.border_image_var, width=18).grid(row=1, column=7, sticky=tk.W)
         ttk.Button(frame, text="选择", command=self._select_border_image).grid(row=1, column=8, padx=4)
         ttk.Button(frame, text="清除", command=self._clear_border_image).grid(row=1, column=9, padx=4)
 
         # Anti dedup
         ttk.Label(frame, text="防检测模式:").grid(row=2, column=0, sticky=tk.W, pady=4)
-        self.antidedup_mode_var = tk.StringVar(value="heavy")
         ttk.Combobox(
             frame, textvariable=self.antidedup_mode_var, values=("none", "light", "medium", "heavy"), width=10
         ).grid(row=2, column=1, sticky=tk.W)
 
-        self.allow_mirror_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(frame, text="允许随机镜像", variable=self.allow_mirror_var).grid(row=2, column=2, sticky=tk.W)
 
         ttk.Label(frame, text="噪点强度:").grid(row=2, column=3, sticky=tk.W)
-        self.noise_var = tk.DoubleVar(value=0.025)
         ttk.Entry(frame, textvariable=self.noise_var, width=6).grid(row=2, column=4, sticky=tk.W)
 
         ttk.Label(frame, text="颜色扰动:").grid(row=2, column=5, sticky=tk.W)
-        self.color_var = tk.DoubleVar(value=0.08)
         ttk.Entry(frame, textvariable=self.color_var, width=6).grid(row=2, column=6, sticky=tk.W)
 
         ttk.Label(frame, text="旋转范围:").grid(row=3, column=0, sticky=tk.W)
-        self.rot_min_var = tk.DoubleVar(value=-0.5)
-        self.rot_max_var = tk.DoubleVar(value=0.5)
         ttk.Entry(frame, textvariable=self.rot_min_var, width=6).grid(row=3, column=1, sticky=tk.W)
         ttk.Entry(frame, textvariable=self.rot_max_var, width=6).grid(row=3, column=2, sticky=tk.W)
 
         ttk.Label(frame, text="裁剪余量:").grid(row=3, column=3, sticky=tk.W)
-        self.crop_var = tk.DoubleVar(value=0.05)
         ttk.Entry(frame, textvariable=self.crop_var, width=6).grid(row=3, column=4, sticky=tk.W)
 
         ttk.Label(frame, text="水印文本:").grid(row=3, column=5, sticky=tk.W)
-        self.watermark_text_var = tk.StringVar()
         ttk.Entry(frame, textvariable=self.watermark_text_var, width=15).grid(row=3, column=6, sticky=tk.W)
-        self.random_watermark_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(frame, text="自动随机", variable=self.random_watermark_var).grid(
             row=3, column=7, sticky=tk.W, padx=(4, 0)
         )
 
         ttk.Label(frame, text="水印数量:").grid(row=4, column=0, sticky=tk.W)
-        self.watermark_min_var = tk.IntVar(value=15)
-        self.watermark_max_var = tk.IntVar(value=25)
         ttk.Entry(frame, textvariable=self.watermark_min_var, width=6).grid(row=4, column=1, sticky=tk.W)
         ttk.Entry(frame, textvariable=self.watermark_max_var, width=6).grid(row=4, column=2, sticky=tk.W)
 
         ttk.Label(frame, text="水印透明度:").grid(row=4, column=3, sticky=tk.W)
-        self.watermark_opacity_min_var = tk.DoubleVar(value=0.05)
-        self.watermark_opacity_max_var = tk.DoubleVar(value=0.10)
         ttk.Entry(frame, textvariable=self.watermark_opacity_min_var, width=6).grid(row=4, column=4, sticky=tk.W)
         ttk.Entry(frame, textvariable=self.watermark_opacity_max_var, width=6).grid(row=4, column=5, sticky=tk.W)
 
         ttk.Label(frame, text="水印缩放:").grid(row=5, column=0, sticky=tk.W)
-        self.watermark_scale_min_var = tk.DoubleVar(value=0.02)
-        self.watermark_scale_max_var = tk.DoubleVar(value=0.05)
         ttk.Entry(frame, textvariable=self.watermark_scale_min_var, width=6).grid(row=5, column=1, sticky=tk.W)
         ttk.Entry(frame, textvariable=self.watermark_scale_max_var, width=6).grid(row=5, column=2, sticky=tk.W)
 
         ttk.Label(frame, text="进程数:").grid(row=4, column=6, sticky=tk.W)
-        self.worker_var = tk.IntVar(value=8)
         ttk.Entry(frame, textvariable=self.worker_var, width=6).grid(row=4, column=7, sticky=tk.W)
 
         ttk.Label(frame, text="随机种子:").grid(row=4, column=8, sticky=tk.W, padx=(8, 0))
-        self.seed_var = tk.StringVar()
         ttk.Entry(frame, textvariable=self.seed_var, width=10).grid(row=4, column=9, sticky=tk.W)
 
         ttk.Label(frame, text="纹理叠加:").grid(row=5, column=3, sticky=tk.W)
-        self.texture_enabled_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(frame, text="启用", variable=self.texture_enabled_var).grid(row=5, column=4, sticky=tk.W)
-        self.texture_path_var = tk.StringVar()
         ttk.Entry(frame, textvariable=self.texture_path_var, width=18).grid(row=5, column=5, sticky=tk.W)
         ttk.Button(frame, text="选择", command=self._select_texture_image).grid(row=5, column=6, padx=4)
         ttk.Button(frame, text="清除", command=self._clear_texture_image).grid(row=5, column=7, padx=4)
         ttk.Label(frame, text="透明度:").grid(row=5, column=8, sticky=tk.W)
-        self.texture_opacity_var = tk.DoubleVar(value=0.1)
         ttk.Entry(frame, textvariable=self.texture_opacity_var, width=6).grid(row=5, column=9, sticky=tk.W)
 
-        self.validation_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(frame, text="启用自动验证", variable=self.validation_var).grid(
             row=6, column=3, sticky=tk.W, padx=(12, 0)
         )
@@ -570,8 +812,6 @@ class ImageAutomationApp(tk.Tk):
         frame = ttk.LabelFrame(parent, text="辅助工具", padding=8)
         frame.pack(fill=tk.X, expand=False, pady=8)
 
-        self._aux_tool_label_map = {self._auxiliary_tools[tid].label: tid for tid in self._aux_tool_order}
-
         if len(self._aux_tool_order) == 1:
             descriptor = self._auxiliary_tools[self._aux_tool_order[0]]
             self._aux_tool_selector_var = None
@@ -609,30 +849,47 @@ class ImageAutomationApp(tk.Tk):
 
     def _add_source(self) -> None:
         path = filedialog.askdirectory(title="选择源目录", initialdir=str(self.default_dir))
-        if not path:
-            return
+        if path:
+            # 路径解析涉及文件系统访问，推迟到空闲时执行，让对话框先关闭。
+            self.after_idle(self._finish_add_source, path)
+
+    def _finish_add_source(self, path: str) -> None:
         try:
             resolved = self._normalize_path(path)
         except ValueError:
             return
-        if resolved in self.sources:
+        self._add_sources([resolved])
+
+    def _add_sources(self, paths: List[Path]) -> None:
+        """批量登记源目录：去重后以一次 Listbox.insert 调用写入全部新条目。"""
+
+        new_paths: List[Path] = []
+        for path in paths:
+            if path in self._source_set:
+                continue
+            self._source_set.add(path)
+            new_paths.append(path)
+        if not new_paths:
             return
-        self.sources.append(resolved)
-        self.source_listbox.insert(tk.END, str(resolved))
-        if resolved.is_dir():
-            self.default_dir = resolved
+        self.sources.extend(new_paths)
+        self.source_listbox.insert(tk.END, *map(str, new_paths))
+        last = new_paths[-1]
+        if last.is_dir():
+            self.default_dir = last
 
     def _remove_selected_source(self) -> None:
         selection = list(self.source_listbox.curselection())
         selection.reverse()
         for idx in selection:
             self.source_listbox.delete(idx)
-            self.sources.pop(idx)
+            self._source_set.discard(self.sources.pop(idx))
 
     def _select_output(self) -> None:
         path = filedialog.askdirectory(title="选择输出目录", initialdir=str(self.default_dir))
-        if not path:
-            return
+        if path:
+            self.after_idle(self._finish_select_output, path)
+
+    def _finish_select_output(self, path: str) -> None:
         try:
             resolved = self._normalize_path(path)
         except ValueError:
@@ -646,8 +903,10 @@ class ImageAutomationApp(tk.Tk):
         filename = filedialog.askopenfilename(
             title="选择边框 PNG", filetypes=[("PNG 文件", "*.png")], initialdir=str(self.default_dir)
         )
-        if not filename:
-            return
+        if filename:
+            self.after_idle(self._finish_select_border_image, filename)
+
+    def _finish_select_border_image(self, filename: str) -> None:
         try:
             resolved = self._normalize_path(filename)
         except ValueError:
@@ -664,8 +923,10 @@ class ImageAutomationApp(tk.Tk):
         filename = filedialog.askopenfilename(
             title="选择纹理图片", filetypes=[("图像文件", "*.png *.jpg *.jpeg")], initialdir=str(self.default_dir)
         )
-        if not filename:
-            return
+        if filename:
+            self.after_idle(self._finish_select_texture_image, filename)
+
+    def _finish_select_texture_image(self, filename: str) -> None:
         try:
             resolved = self._normalize_path(filename)
         except ValueError:
@@ -684,169 +945,300 @@ class ImageAutomationApp(tk.Tk):
             messagebox.showinfo("提示", "任务正在执行中，请稍候。")
             return
 
-        if not self.sources:
-            messagebox.showwarning("提示", "请先添加至少一个源目录。")
-            return
-
-        if not self.output_dir and not self.output_var.get():
-            messagebox.showwarning("提示", "请先选择输出目录。")
-            return
-
-        try:
-            self.output_dir = self._normalize_path(self.output_var.get())
-        except ValueError as exc:
-            messagebox.showerror("配置错误", str(exc))
-            return
-
-        try:
-            job = self._build_config()
-        except ValueError as exc:
-            messagebox.showerror("配置错误", str(exc))
+        job, errors = self._validate_job()
+        if errors:
+            messagebox.showerror("配置错误", "\n".join(errors))
             return
 
         self._append_log("开始执行任务...")
         self.progress_var.set(0)
         self._progress_total = 0
+        self._progress_percent = 0
 
         self._worker_thread = threading.Thread(
             target=self._run_pipeline_thread, args=(job,), daemon=True
         )
         self._worker_thread.start()
 
+    def _validate_job(self) -> Tuple[Optional[JobConfig], List[str]]:
+        """一次性校验全部输入，返回任务配置与错误列表，便于只弹出一个对话框。"""
+
+        errors: List[str] = []
+        if not self.sources:
+            errors.append("请先添加至少一个源目录。")
+
+        output_value = self.output_var.get()
+        if not self.output_dir and not output_value:
+            errors.append("请先选择输出目录。")
+        else:
+            try:
+                self.output_dir = self._normalize_path(output_value)
+            except ValueError as exc:
+                errors.append(str(exc))
+
+        if errors:
+            # 输出目录无效时无法构建配置，避免重复报告同一问题。
+            return None, errors
+
+        try:
+            return self._build_config(), errors
+        except ValueError as exc:
+            errors.append(str(exc))
+            return None, errors
+
+    def _read_options(self) -> Dict[str, Any]:
+        """一次性读取全部选项变量的当前值。"""
+
+        return {name: var.get() for name, var in self._option_vars.items()}
+
     def _build_config(self) -> JobConfig:
-        ratio_parts = self.ratio_var.get().split(":")
-        if len(ratio_parts) != 2:
+        vals = self._read_options()
+
+        ratio_match = _RATIO_RE.match(vals["ratio"])
+        if ratio_match is None:
             raise ValueError("比例必须形如 1:1")
-        ratio_w, ratio_h = int(ratio_parts[0]), int(ratio_parts[1])
+        ratio_w, ratio_h = int(ratio_match.group(1)), int(ratio_match.group(2))
+        if ratio_w <= 0 or ratio_h <= 0:
+            raise ValueError("比例必须大于 0")
 
-        border_image = (
-            self._normalize_path(self.border_image_var.get())
-            if self.border_image_var.get().strip()
-            else None
-        )
+        border_value = vals["border_image"].strip()
+        border_image = self._normalize_path(border_value) if border_value else None
         if border_image and not border_image.is_file():
             border_image = None
 
         styling = StylingConfig(
             aspect_ratio=(ratio_w, ratio_h),
-            min_size=(self.min_width_var.get(), self.min_height_var.get()),
-            mode=self.mode_var.get(),
-            background_color=self.bg_color_var.get(),
-            border_color=self.border_color_var.get() or None,
-            border_thickness=max(0, self.border_thickness_var.get()),
+            min_size=(vals["min_width"], vals["min_height"]),
+            mode=vals["mode"],
+            background_color=vals["bg_color"],
+            border_color=vals["border_color"] or None,
+            border_thickness=max(0, vals["border_thickness"]),
             border_image=border_image,
         )
 
+        wmin, wmax = vals["watermark_min"], vals["watermark_max"]
+        omin, omax = vals["watermark_opacity_min"], vals["watermark_opacity_max"]
+        smin, smax = vals["watermark_scale_min"], vals["watermark_scale_max"]
         watermark = WatermarkConfig(
-            enabled=self.antidedup_mode_var.get() == "heavy",
-            text=self._resolve_watermark_text(),
-            count_range=(
-                min(self.watermark_min_var.get(), self.watermark_max_var.get()),
-                max(self.watermark_min_var.get(), self.watermark_max_var.get()),
-            ),
-            opacity_range=(
-                min(self.watermark_opacity_min_var.get(), self.watermark_opacity_max_var.get()),
-                max(self.watermark_opacity_min_var.get(), self.watermark_opacity_max_var.get()),
-            ),
-            scale_range=(
-                min(self.watermark_scale_min_var.get(), self.watermark_scale_max_var.get()),
-                max(self.watermark_scale_min_var.get(), self.watermark_scale_max_var.get()),
-            ),
+            enabled=vals["antidedup_mode"] == "heavy",
+            text=self._resolve_watermark_text(vals["watermark_text"], vals["random_watermark"]),
+            count_range=self._ordered(wmin, wmax),
+            opacity_range=self._ordered(omin, omax),
+            scale_range=self._ordered(smin, smax),
         )
 
         texture_path = None
-        texture_value = self.texture_path_var.get().strip()
+        texture_value = vals["texture_path"].strip()
         if texture_value:
             texture_path = self._normalize_path(texture_value)
             if not texture_path.is_file():
                 raise ValueError("纹理图片文件不存在")
 
         texture = TextureConfig(
-            enabled=self.texture_enabled_var.get() and texture_path is not None,
+            enabled=vals["texture_enabled"] and texture_path is not None,
             image_path=texture_path,
-            opacity=self._clamp_opacity(self.texture_opacity_var.get()),
+            opacity=self._clamp_opacity(vals["texture_opacity"]),
         )
 
         anti_dedup = AntiDedupConfig(
-            mode=self.antidedup_mode_var.get(),
-            allow_mirror=self.allow_mirror_var.get(),
-            noise_strength=self.noise_var.get(),
-            color_jitter_strength=self.color_var.get(),
-            rotation_range=(self.rot_min_var.get(), self.rot_max_var.get()),
-            crop_margin=self.crop_var.get(),
+            mode=vals["antidedup_mode"],
+            allow_mirror=vals["allow_mirror"],
+            noise_strength=vals["noise"],
+            color_jitter_strength=vals["color"],
+            rotation_range=(vals["rot_min"], vals["rot_max"]),
+            crop_margin=vals["crop"],
             watermark=watermark,
             texture=texture,
         )
 
-        seed_value = self.seed_var.get().strip()
+        seed_value = vals["seed"].strip()
         random_seed = int(seed_value) if seed_value else None
 
         return JobConfig(
-            sources=self.sources.copy(),
-            output=OutputConfig(output_dir=self.output_dir, conflict_strategy=self.conflict_var.get()),
+            sources=tuple(self.sources),
+            output=OutputConfig(output_dir=self.output_dir, conflict_strategy=vals["conflict"]),
             styling=styling,
             anti_dedup=anti_dedup,
-            validation=ValidationConfig(enabled=self.validation_var.get()),
-            allow_recursive=self.recursive_var.get(),
-            max_workers=max(1, self.worker_var.get()),
+            validation=ValidationConfig(enabled=vals["validation"]),
+            allow_recursive=vals["recursive"],
+            max_workers=max(1, vals["worker"]),
             random_seed=random_seed,
         )
 
-    def _resolve_watermark_text(self) -> str:
-        text = self.watermark_text_var.get().strip()
-        if self.random_watermark_var.get() and not text:
+    def _resolve_watermark_text(self, text: str, use_random: bool) -> str:
+        text = text.strip()
+        if use_random and not text:
             text = self._generate_random_watermark_text()
             self.watermark_text_var.set(text)
         return text
 
     def _generate_random_watermark_text(self) -> str:
-        letters = string.ascii_uppercase
-        return random.choice(letters)
+        return random.choice(self._ASCII_UPPER)
+
+    @staticmethod
+    def _ordered(a: Any, b: Any) -> Tuple[Any, Any]:
+        """返回按升序排列的二元组，只需一次比较。"""
+
+        return (a, b) if a <= b else (b, a)
 
     @staticmethod
     def _clamp_opacity(value: float) -> float:
         return max(0.0, min(float(value), 1.0))
 
     def _run_pipeline_thread(self, job: JobConfig) -> None:
-        def progress_callback(update: ProgressUpdate) -> None:
-            self._event_queue.put(("progress", update))
+        """在独立进程中运行批处理，本线程只负责把子进程事件转发给 GUI 队列。"""
 
+        events = multiprocessing.Queue()
+        # 转发循环对每个事件执行一次，预先绑定方法避免重复查找。
+        post_event = self._post_event
+        process = multiprocessing.Process(
+            target=_run_pipeline_process, args=(job, events), name="image-automation-pipeline"
+        )
         try:
-            result = process_batch(job, progress_callback=progress_callback)
-            self._event_queue.put(("done", result))
+            process.start()
+            while True:
+                # 先记录存活状态：进程退出前会把队列数据全部写入管道，
+                # 若退出后仍取不到事件，说明子进程异常终止。
+                alive = process.is_alive()
+                try:
+                    kind, payload = events.get(timeout=PIPELINE_EVENT_TIMEOUT)
+                except queue.Empty:
+                    if not alive:
+                        raise RuntimeError(f"处理进程异常退出 (exitcode={process.exitcode})") from None
+                    continue
+                post_event(kind, payload)
+                if kind in ("done", "error"):
+                    break
         except Exception as exc:  # noqa: BLE001
-            self._event_queue.put(("error", str(exc)))
+            post_event("error", str(exc))
+        finally:
+            process.join()
+            events.close()
 
-    def _poll_queue(self) -> None:
+    def _post_event(self, kind: str, payload: Any) -> None:
+        """工作线程投递事件，并唤醒主线程立即处理（自管道或虚拟事件）。"""
+
+        if kind == "progress":
+            self._put_progress(payload)
+        else:
+            self._terminal_queue.put((kind, payload))
+        if self._wakeup_pending:
+            # 主线程尚未处理上一次唤醒，届时会一并取走本事件。
+            return
+        self._wakeup_pending = True
+        pipe = self._wakeup_pipe
         try:
-            while True:
-                kind, payload = self._event_queue.get_nowait()
-                if kind == "progress":
-                    self._handle_progress(payload)
-                elif kind == "done":
-                    self._handle_done(payload)
-                elif kind == "error":
-                    self._handle_error(payload)
-        except queue.Empty:
+            if pipe is not None:
+                os.write(pipe[1], b"\0")
+            else:
+                self.event_generate(PIPELINE_EVENT, when="tail")
+        except BlockingIOError:
+            # 管道已满说明已有未读的唤醒字节，主线程必然会被唤醒。
             pass
+        except (OSError, tk.TclError, RuntimeError):
+            # 窗口销毁或主循环未运行时交由兜底轮询处理。
+            self._wakeup_pending = False
+
+    def _put_progress(self, update: ProgressUpdate) -> None:
+        """投递进度事件。
+
+        带消息的事件进入无界队列，逐条保留；纯计数事件队列已满时丢弃最旧的一条，
+        计数只有最新值才有意义。
+        """
+
+        if update.level >= PROGRESS_LEVEL_MESSAGE or update.message:
+            self._message_queue.put(update)
+            return
+        events = self._event_queue
+        while True:
+            try:
+                events.put_nowait(update)
+                return
+            except queue.Full:
+                try:
+                    events.get_nowait()
+                except queue.Empty:
+                    continue
+
+    def _poll_queue(self) -> None:
+        """兜底轮询：唤醒事件丢失时仍能取走队列中的事件。"""
+
+        drained = 0
+        try:
+            drained = self._drain_queue()
         finally:
-            self.after(200, self._poll_queue)
+            self._poll_interval = self._next_poll_interval(drained)
+            self.after(self._poll_interval, self._poll_queue)
+
+    def _next_poll_interval(self, drained: int) -> int:
+        """兜底轮询取到事件说明唤醒不可靠，此时退回快速轮询。"""
+
+        return POLL_INTERVAL_BUSY_MS if drained else POLL_INTERVAL_IDLE_MS
+
+    def _drain_queue(self) -> int:
+        """在主线程中处理队列中的事件，返回本次处理的数量。"""
+
+        # 先清除标记再读取队列，之后投递的事件会重新触发唤醒。
+        self._wakeup_pending = False
+        drained = 0
+        # 终止事件总在全部进度事件之后投递：先确认其已到达，再清空进度队列即可保证顺序。
+        terminal_ready = not self._terminal_queue.empty()
+        latest_progress: Optional[ProgressUpdate] = None
+        messages: List[str] = []
+        try:
+            # 消息与计数分属两个队列，完成数单调递增，进度条取本批中完成数最大的事件。
+            for source in (self._message_queue, self._event_queue):
+                while drained < POLL_MAX_EVENTS:
+                    try:
+                        payload = source.get_nowait()
+                    except queue.Empty:
+                        break
+                    drained += 1
+                    if latest_progress is None or payload.completed >= latest_progress.completed:
+                        latest_progress = payload
+                    if payload.message:
+                        messages.append(payload.message)
+            self._handle_progress(latest_progress, messages)
+
+            if terminal_ready and drained < POLL_MAX_EVENTS:
+                while True:
+                    try:
+                        kind, payload = self._terminal_queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    drained += 1
+                    if kind == "done":
+                        self._handle_done(payload)
+                    elif kind == "error":
+                        self._handle_error(payload)
+        finally:
+            if drained >= POLL_MAX_EVENTS:
+                # 单次处理量有上限，剩余事件在下一个空闲时刻继续处理。
+                self.after_idle(self._drain_queue)
+        return drained
+
+    def _handle_progress(self, update: Optional[ProgressUpdate], messages: List[str]) -> None:
+        """一次性应用一批进度事件：进度条只取最新值，日志合并为一次写入。"""
 
-    def _handle_progress(self, update: ProgressUpdate) -> None:
-        if update.total:
+        if update is not None and update.total:
             self._progress_total = update.total
-            percent = (update.completed / update.total) * 100
-            self.progress_var.set(percent)
-        if update.message:
-            self._append_log(update.message)
+            # 只在整数百分比增加时写回 Tcl 变量，大批量任务的进度条重绘至多 100 次；
+            # 消息与计数分队列投递，较旧的计数可能晚到，进度条在单次任务内只前进不后退。
+            percent = update.completed * 100 // update.total
+            if percent > self._progress_percent:
+                self._progress_percent = percent
+                self.progress_var.set(percent)
+        if messages:
+            self._append_log("\n".join(messages))
 
     def _handle_done(self, result: BatchResult) -> None:
-        self._append_log("任务完成。")
+        succeeded, skipped, failed = len(result.succeeded), len(result.skipped), len(result.failed)
         summary = (
-            f"成功 {len(result.succeeded)} 张，跳过 {len(result.skipped)} 张，失败 {len(result.failed)} 张。\n"
+            f"成功 {succeeded} 张，跳过 {skipped} 张，失败 {failed} 张。\n"
             f"报告文件保存在 {self.output_dir / 'report.csv'}。"
         )
-        self._append_log(summary)
+        # 完成提示与汇总合并为一次写入，减少弹窗前的控件刷新。
+        self._append_log("任务完成。\n" + summary)
         messagebox.showinfo("完成", summary)
 
     def _handle_error(self, message: str) -> None:
@@ -856,6 +1248,7 @@ class ImageAutomationApp(tk.Tk):
     def _append_log(self, text: str) -> None:
         self.log_text.configure(state=tk.NORMAL)
         self.log_text.insert(tk.END, text + "\n")
+        _trim_text_widget(self.log_text)
         self.log_text.configure(state=tk.DISABLED)
         self.log_text.see(tk.END)
 
@@ -3,23 +3,39 @@
 from __future__ import annotations
 
 import logging
-import random
+from functools import lru_cache
+from typing import Optional
+
+import cv2
 import numpy as np
-from PIL import Image, ImageDraw, ImageEnhance, ImageFont, ImageOps
+from PIL import Image, ImageDraw, ImageEnhance, ImageFont, ImageOps, ImageStat
 
 from image_automation.core.config import AntiDedupConfig, TextureConfig, WatermarkConfig
 
 LOGGER = logging.getLogger(__name__)
 
 MIRROR_PROBABILITY = 0.1
+# ITU-R 601-2 亮度权重，与 Pillow 的 "L" 模式转换一致
+_LUMA_WEIGHTS = (0.299, 0.587, 0.114)
+_LUT_MODES = frozenset({"RGB", "RGBA", "L", "LA"})
+# 255 * (2 * amplitude + 1) 需在 int16 范围内
+_BYTE_NOISE_MAX_AMPLITUDE = 63
+
 
+def apply_antidedup(
+    image: Image.Image, config: AntiDedupConfig, rng: np.random.Generator
+) -> tuple[Image.Image, list[str]]:
+    """根据配置对图片执行随机扰动与水印，返回处理后的图片与说明。
 
-def apply_antidedup(image: Image.Image, config: AntiDedupConfig, rng: random.Random) -> tuple[Image.Image, list[str]]:
-    """根据配置对图片执行随机扰动与水印，返回处理后的图片与说明。"""
+    所有随机量都取自同一个 NumPy 生成器：标量参数逐个抽取，噪点与水印参数整块抽取。
+    噪点、旋转裁剪与纹理叠加共用同一个 RGB ``np.ndarray``，
+    整条流水线只在进入与离开数组阶段时各转换一次。
+    """
 
     mode = (config.mode or "none").lower()
     operations: list[str] = []
     working = image
+    array: Optional[np.ndarray] = None
 
     if mode != "none":
         if config.allow_mirror and rng.random() < MIRROR_PROBABILITY:
@@ -28,13 +44,21 @@ def apply_antidedup(image: Image.Image, config: AntiDedupConfig, rng: random.Ran
 
         if mode in {"light", "medium", "heavy"}:
             working = _apply_color_jitter(working, config, rng, operations)
-            working = _apply_noise(working, config, rng, operations)
+            array = _to_rgb_array(working)
+            _apply_noise(array, config, rng, operations)
 
         if mode in {"medium", "heavy"}:
-            working = _apply_rotation_crop(working, config, rng, operations)
+            if array is None:
+                array = _to_rgb_array(working)
+            array = _apply_rotation_crop(array, config, rng, operations)
 
     if config.texture.enabled:
-        working = _apply_texture(working, config.texture, operations)
+        if array is None:
+            array = _to_rgb_array(working)
+        array = _apply_texture(array, config.texture, operations)
+
+    if array is not None:
+        working = Image.fromarray(array, "RGB")
 
     if mode == "heavy":
         working = _apply_watermarks(working, config.watermark, rng, operations)
@@ -42,8 +66,16 @@ def apply_antidedup(image: Image.Image, config: AntiDedupConfig, rng: random.Ran
     return working, operations
 
 
+def _to_rgb_array(image: Image.Image) -> np.ndarray:
+    """复制为可写的 RGB 数组，作为后续数组阶段的工作缓冲区。"""
+
+    if image.mode != "RGB":
+        image = image.convert("RGB")
+    return np.array(image)
+
+
 def _apply_color_jitter(
-    image: Image.Image, config: AntiDedupConfig, rng: random.Random, operations: list[str]
+    image: Image.Image, config: AntiDedupConfig, rng: np.random.Generator, operations: list[str]
 ) -> Image.Image:
     """对亮度、对比度、饱和度进行微调。"""
 
@@ -51,16 +83,17 @@ def _apply_color_jitter(
     if strength <= 0:
         return image
 
-    factors = []
-    for enhancer_cls, name in (
-        (ImageEnhance.Brightness, "brightness"),
-        (ImageEnhance.Contrast, "contrast"),
-        (ImageEnhance.Color, "saturation"),
-    ):
-        delta = rng.uniform(-strength, strength)
-        factor = 1.0 + delta
-        factors.append((name, factor))
-        image = enhancer_cls(image).enhance(factor)
+    names = ("brightness", "contrast", "saturation")
+    factors = list(zip(names, (1.0 + rng.uniform(-strength, strength, size=3)).tolist()))
+    brightness, contrast, saturation = (factor for _, factor in factors)
+
+    if image.mode in _LUT_MODES:
+        # 亮度与对比度都是逐通道的线性变换，合并为一张查找表只需一次整图遍历。
+        image = image.point(_brightness_contrast_lut(image, brightness, contrast))
+    else:
+        image = ImageEnhance.Brightness(image).enhance(brightness)
+        image = ImageEnhance.Contrast(image).enhance(contrast)
+    image = ImageEnhance.Color(image).enhance(saturation)
 
     operations.append(
         "color_jitter(" + ", ".join(f"{name}={factor:.3f}" for name, factor in factors) + ")"
@@ -68,123 +101,212 @@ def _apply_color_jitter(
     return image
 
 
+def _brightness_contrast_lut(image: Image.Image, brightness: float, contrast: float) -> list[int]:
+    """构建与 ImageEnhance.Brightness + Contrast 等效的查找表（Alpha 通道保持不变）。"""
+
+    bands = image.getbands()
+    means = ImageStat.Stat(image).mean
+    if bands[0] == "L":
+        gray_mean = means[0]
+    else:
+        gray_mean = sum(weight * value for weight, value in zip(_LUMA_WEIGHTS, means))
+    # Contrast 以亮度调整后图像的平均灰度为中心；亮度为线性缩放，可由原图均值推得。
+    mean = int(gray_mean * brightness + 0.5)
+
+    curve = []
+    for level in range(256):
+        brightened = min(255, int(level * brightness))
+        curve.append(max(0, min(255, int(mean + (brightened - mean) * contrast))))
+
+    identity = list(range(256))
+    lut: list[int] = []
+    for band in bands:
+        lut.extend(identity if band == "A" else curve)
+    return lut
+
+
 def _apply_noise(
-    image: Image.Image, config: AntiDedupConfig, rng: random.Random, operations: list[str]
-) -> Image.Image:
-    """叠加低强度噪点。"""
+    array: np.ndarray, config: AntiDedupConfig, rng: np.random.Generator, operations: list[str]
+) -> None:
+    """叠加低强度噪点（原地修改 ``array``）。"""
 
     strength = config.noise_strength
     if strength <= 0:
-        return image
+        return
 
-    array = np.asarray(image).astype(np.float32)
-    np_rng = np.random.default_rng(rng.randint(0, 2**32 - 1))
-    noise_map = np_rng.uniform(-1.0, 1.0, size=array.shape).astype(np.float32)
-    array += noise_map * (strength * 255.0)
-    np.clip(array, 0, 255, out=array)
+    # 使用 int16 整数噪声叠加，避免 float32 临时数组带来的额外内存与带宽开销。
+    amplitude = int(round(strength * 255.0))
+    if amplitude:
+        work = array.astype(np.int16)
+        np.add(work, _noise_map(rng, work.shape, amplitude), out=work)
+        np.clip(work, 0, 255, out=work)
+        array[...] = work
 
     operations.append(f"noise(strength={strength:.3f})")
-    noisy = Image.fromarray(array.astype(np.uint8))
-    if noisy.mode != image.mode:
-        noisy = noisy.convert(image.mode)
-    return noisy
+
+
+def _noise_map(rng: np.random.Generator, shape: tuple[int, ...], amplitude: int) -> np.ndarray:
+    """生成取值范围为 [-amplitude, amplitude] 的 int16 噪声。
+
+    低幅度时直接把随机字节线性映射到目标区间，跳过 ``integers`` 的逐元素拒绝采样；
+    分布存在不超过 1/256 的轻微不均匀，对噪点扰动无影响。
+    """
+
+    if amplitude > _BYTE_NOISE_MAX_AMPLITUDE:
+        return rng.integers(-amplitude, amplitude + 1, size=shape, dtype=np.int16)
+
+    noise = np.frombuffer(rng.bytes(int(np.prod(shape))), dtype=np.uint8).reshape(shape).astype(np.int16)
+    noise *= 2 * amplitude + 1
+    noise >>= 8
+    noise -= amplitude
+    return noise
 
 
 def _apply_rotation_crop(
-    image: Image.Image, config: AntiDedupConfig, rng: random.Random, operations: list[str]
-) -> Image.Image:
+    array: np.ndarray, config: AntiDedupConfig, rng: np.random.Generator, operations: list[str]
+) -> np.ndarray:
     """应用微小旋转并裁剪回原尺寸。"""
 
-    angle = rng.uniform(*config.rotation_range)
+    angle = float(rng.uniform(*config.rotation_range))
     if abs(angle) < 1e-3:
-        return image
+        return array
 
-    width, height = image.size
+    # 放大（裁剪边距）与旋转合并为一次仿射变换，直接输出原尺寸；
+    # 边缘以镜像填充，避免旋转后角落出现黑边。
+    height, width = array.shape[:2]
     scale = 1.0 + max(config.crop_margin, 0.0)
-    enlarged_size = (max(1, int(round(width * scale))), max(1, int(round(height * scale))))
-    enlarged = ImageOps.fit(image, enlarged_size, method=Image.LANCZOS, centering=(0.5, 0.5))
-
-    rotated = enlarged.rotate(angle, resample=Image.BICUBIC, expand=True)
-    fitted = ImageOps.fit(rotated, (width, height), method=Image.LANCZOS, centering=(0.5, 0.5))
+    matrix = cv2.getRotationMatrix2D((width / 2.0, height / 2.0), angle, scale)
+    rotated = cv2.warpAffine(
+        array, matrix, (width, height), flags=cv2.INTER_LINEAR, borderMode=cv2.BORDER_REFLECT_101
+    )
 
     operations.append(f"rotate(angle={angle:.3f})")
-    return fitted
+    return rotated
 
 
 def _apply_watermarks(
-    image: Image.Image, watermark_config: WatermarkConfig, rng: random.Random, operations: list[str]
+    image: Image.Image, watermark_config: WatermarkConfig, rng: np.random.Generator, operations: list[str]
 ) -> Image.Image:
-    """添加多重微痕水印。"""
+    """添加多重微痕水印。
 
-    base = image.convert("RGBA")
-    overlay = Image.new("RGBA", base.size, (0, 0, 0, 0))
-    draw = ImageDraw.Draw(overlay)
+    文字只渲染一次为 Alpha 贴图，每个水印仅对贴图做缩放旋转后在所在区域内混合，
+    不再为每个水印创建整图图层。
+    """
 
     count_min, count_max = watermark_config.count_range
     if count_min > count_max:
         count_min, count_max = count_max, count_min
-    count = rng.randint(count_min, count_max)
+    count = int(rng.integers(count_min, count_max, endpoint=True))
+
+    text = watermark_config.text or "digital-dust"
+    sprite = _render_watermark_sprite(text)
+    output = _to_rgb_array(image)
+    height, width = output.shape[:2]
+
+    # 一次性抽取全部水印参数；位置取 [0, 1) 的比例，待贴图尺寸确定后再映射为坐标。
+    opacities = rng.uniform(*watermark_config.opacity_range, size=count)
+    rotations = rng.uniform(*watermark_config.rotation_range, size=count)
+    scales = rng.uniform(*watermark_config.scale_range, size=count)
+    positions = rng.random((count, 2))
+
+    for opacity, rotation, scale, (fx, fy) in zip(
+        opacities.tolist(), rotations.tolist(), scales.tolist(), positions.tolist()
+    ):
+        stamp = _transform_sprite(sprite, 0.5 + scale, rotation)
+        stamp_h, stamp_w = stamp.shape
+
+        max_x = max(1, width - stamp_w)
+        max_y = max(1, height - stamp_h)
+        x = int(fx * (max_x + 1))
+        y = int(fy * (max_y + 1))
+
+        # 水印均为白色，逐个以 over 运算混合与先合成整张图层再叠加等价。
+        region = output[y : y + stamp_h, x : x + stamp_w]
+        if region.size == 0:
+            continue
+        alpha = stamp[: region.shape[0], : region.shape[1], np.newaxis] * opacity
+        blended = region.astype(np.float32)
+        blended += (255.0 - blended) * alpha
+        np.round(blended, out=blended)
+        region[...] = blended
+
+    operations.append(f"watermark(count={count})")
+    return Image.fromarray(output, "RGB")
+
+
+@lru_cache(maxsize=1)
+def _watermark_font() -> Optional[ImageFont.ImageFont]:
+    """加载一次默认字体，供当前进程内的所有水印复用。"""
 
     try:
-        font = ImageFont.load_default()
+        return ImageFont.load_default()
     except OSError:
-        font = None
+        return None
 
-    text = watermark_config.text or "digital-dust"
-    width, height = base.size
 
-    for _ in range(count):
-        opacity = rng.uniform(*watermark_config.opacity_range)
-        rotation = rng.uniform(*watermark_config.rotation_range)
-        scale = rng.uniform(*watermark_config.scale_range)
+@lru_cache(maxsize=32)
+def _render_watermark_sprite(text: str) -> np.ndarray:
+    """以默认字体渲染文字，返回取值 0~1 的 float32 Alpha 贴图（按文字缓存）。"""
 
-        text_bounds = draw.textbbox((0, 0), text, font=font)
-        text_width = max(1, text_bounds[2] - text_bounds[0])
-        text_height = max(1, text_bounds[3] - text_bounds[1])
+    font = _watermark_font()
+    text_bounds = ImageDraw.Draw(Image.new("L", (1, 1))).textbbox((0, 0), text, font=font)
+    text_width = max(1, text_bounds[2] - text_bounds[0])
+    text_height = max(1, text_bounds[3] - text_bounds[1])
 
-        base_canvas = Image.new("RGBA", (text_width, text_height), (0, 0, 0, 0))
-        canvas_draw = ImageDraw.Draw(base_canvas)
-        canvas_draw.text((0, 0), text, fill=(255, 255, 255, int(255 * opacity)), font=font)
+    canvas = Image.new("L", (text_width, text_height), 0)
+    ImageDraw.Draw(canvas).text((0, 0), text, fill=255, font=font)
+    sprite = np.asarray(canvas, dtype=np.float32) / 255.0
+    sprite.setflags(write=False)
+    return sprite
 
-        target_w = max(1, int(text_width * (0.5 + scale)))
-        target_h = max(1, int(text_height * (0.5 + scale)))
-        scaled = ImageOps.contain(base_canvas, (target_w, target_h), method=Image.LANCZOS)
 
-        rotated = scaled.rotate(rotation, expand=True)
+def _transform_sprite(sprite: np.ndarray, factor: float, angle: float) -> np.ndarray:
+    """缩放并旋转贴图，画布随旋转扩展以容纳完整文字。"""
 
-        max_x = max(1, width - rotated.width)
-        max_y = max(1, height - rotated.height)
-        x = rng.randint(0, max_x)
-        y = rng.randint(0, max_y)
+    height, width = sprite.shape
+    target_w = max(1, int(width * factor))
+    target_h = max(1, int(height * factor))
+    interpolation = cv2.INTER_AREA if factor < 1 else cv2.INTER_LINEAR
+    scaled = cv2.resize(sprite, (target_w, target_h), interpolation=interpolation)
 
-        overlay.alpha_composite(rotated, dest=(x, y))
-
-    combined = Image.alpha_composite(base, overlay)
-    operations.append(f"watermark(count={count})")
-    return combined.convert("RGB")
+    matrix = cv2.getRotationMatrix2D((target_w / 2.0, target_h / 2.0), angle, 1.0)
+    cos, sin = abs(matrix[0, 0]), abs(matrix[0, 1])
+    rotated_w = max(1, int(round(target_h * sin + target_w * cos)))
+    rotated_h = max(1, int(round(target_h * cos + target_w * sin)))
+    matrix[0, 2] += rotated_w / 2.0 - target_w / 2.0
+    matrix[1, 2] += rotated_h / 2.0 - target_h / 2.0
+    return cv2.warpAffine(scaled, matrix, (rotated_w, rotated_h), flags=cv2.INTER_LINEAR, borderValue=0.0)
 
 
-def _apply_texture(image: Image.Image, texture_config: TextureConfig, operations: list[str]) -> Image.Image:
-    """按配置叠加纹理图层。"""
+def _apply_texture(array: np.ndarray, texture_config: TextureConfig, operations: list[str]) -> np.ndarray:
+    """按配置叠加纹理图层（原地混合到 ``array``）。"""
 
     if not texture_config.image_path:
-        return image
+        return array
 
     opacity = max(0.0, min(texture_config.opacity, 1.0))
     if opacity <= 0:
-        return image
+        return array
 
+    height, width = array.shape[:2]
     try:
-        with Image.open(texture_config.image_path) as texture_img:
-            texture = texture_img.convert("RGB")
+        texture = _load_fitted_texture(str(texture_config.image_path), (width, height))
     except OSError as exc:
         LOGGER.warning("无法加载纹理图片 %s: %s", texture_config.image_path, exc)
-        return image
+        return array
 
-    texture = ImageOps.fit(texture, image.size, Image.LANCZOS)
-    if texture.mode != image.mode:
-        texture = texture.convert(image.mode)
-
-    blended = Image.blend(image, texture, opacity)
+    # 与 Image.blend 相同：image * (1 - opacity) + texture * opacity
+    cv2.addWeighted(array, 1.0 - opacity, texture, opacity, 0.0, dst=array)
     operations.append(f"texture(opacity={opacity:.3f})")
-    return blended
+    return array
+
+
+@lru_cache(maxsize=8)
+def _load_fitted_texture(path: str, size: tuple[int, int]) -> np.ndarray:
+    """加载纹理并裁剪缩放到目标尺寸；批处理中输出尺寸通常一致，结果按进程缓存。"""
+
+    with Image.open(path) as texture_img:
+        texture = texture_img.convert("RGB")
+    fitted = np.asarray(ImageOps.fit(texture, size, Image.LANCZOS))
+    fitted.setflags(write=False)
+    return fitted
@@ -2,15 +2,64 @@
 
 from __future__ import annotations
 
+import hashlib
 import logging
-from dataclasses import dataclass
+import os
+import re
+import sqlite3
+import struct
+import subprocess
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache, partial
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterator, Sequence
+from typing import Any, Iterator, Sequence
 
+import cv2
+import numpy as np
 from PIL import Image, ImageOps
 
 _RESAMPLING = getattr(Image, "Resampling", Image)
-_SUPPORTED_EXTENSIONS = {".jpg", ".jpeg", ".png"}
+_SUPPORTED_EXTENSIONS = frozenset({".jpg", ".jpeg", ".png"})
+# Pillow's default JPEG quality, which resized main images were always saved with.
+_JPEG_QUALITY = 75
+# Pillow resampling filters accepted by ``resample`` and their OpenCV counterparts.
+_CV2_INTERPOLATION = {
+    _RESAMPLING.NEAREST: cv2.INTER_NEAREST,
+    _RESAMPLING.BILINEAR: cv2.INTER_LINEAR,
+    _RESAMPLING.BICUBIC: cv2.INTER_CUBIC,
+    _RESAMPLING.BOX: cv2.INTER_AREA,
+    _RESAMPLING.LANCZOS: cv2.INTER_LANCZOS4,
+}
+_JPEG_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8, cv2.IMREAD_REDUCED_GRAYSCALE_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4, cv2.IMREAD_REDUCED_GRAYSCALE_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2, cv2.IMREAD_REDUCED_GRAYSCALE_2),
+)
+# Format/mode pairs OpenCV decodes and re-encodes without changing the channel layout;
+# everything else (CMYK JPEG, palette PNG, WEBP, GIF, ...) keeps going through Pillow.
+_CV2_RESIZE_MODES = {
+    "JPEG": frozenset({"L", "RGB"}),
+    "PNG": frozenset({"L", "RGB", "RGBA"}),
+}
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# JPEG start-of-frame markers (DHT, JPG and DAC share the range but carry no dimensions).
+_JPEG_SOF_MARKERS = frozenset(range(0xC0, 0xD0)) - {0xC4, 0xC8, 0xCC}
+# Markers without a length field (TEM, RST0-RST7) that may legally precede the frame header.
+_JPEG_STANDALONE_MARKERS = frozenset({0x01, *range(0xD0, 0xD8)})
+# Whitespace tesseract inserts between characters; removed before matching forbidden terms.
+_OCR_WHITESPACE_TABLE = str.maketrans("", "", " \n\r\t\u3000")
+_OCR_PREPARE_WORKERS = 2
+# Images whose 128px probe spans fewer grey levels than this cannot contain legible text.
+_INK_PROBE_SIZE = 128
+_INK_MIN_CONTRAST = 6
+_OCR_CACHE_NAME = "ocr_cache.sqlite3"
+# Hide the console window tesseract would otherwise open for every batch on Windows.
+_SUBPROCESS_FLAGS = getattr(subprocess, "CREATE_NO_WINDOW", 0)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -26,6 +75,16 @@ class AdjustmentStats:
     errors: int = 0
     deleted_files: int = 0
 
+    def merge(self, other: "AdjustmentStats") -> None:
+        """Accumulate counters from another stats object."""
+
+        self.total_folders += other.total_folders
+        self.inspected_files += other.inspected_files
+        self.adjusted_files += other.adjusted_files
+        self.missing_files += other.missing_files
+        self.errors += other.errors
+        self.deleted_files += other.deleted_files
+
 
 def ensure_main_image_size(
     root_dir: Path,
@@ -34,58 +93,72 @@ def ensure_main_image_size(
     logger: logging.Logger | None = None,
     forbidden_terms: Sequence[str] | None = None,
     ocr_languages: str = "chi_sim+eng",
+    max_workers: int = 1,
+    resample: int = _RESAMPLING.LANCZOS,
+    ocr_always: bool = False,
+    stable_order: bool = False,
 ) -> AdjustmentStats:
     """Ensure each subfolder under ``root_dir`` contains a compliant 主图01.jpg.
 
     A compliant image must be square and both wider and taller than or equal to ``target_size``.
-    Non-compliant images are resized to ``target_size`` × ``target_size`` using high-quality scaling.
+    Non-compliant images are resized to ``target_size`` × ``target_size`` with ``resample``
+    (a Pillow filter, Lanczos by default; ``Image.BICUBIC`` trades a little sharpness for speed).
     When ``forbidden_terms`` is provided, any image whose OCR 结果包含指定词语将被删除。
+    Near-uniform images are treated as text-free without running OCR unless ``ocr_always`` is set.
+    Folders and images are visited in directory order as ``scandir`` returns them, so work starts
+    before a wide tree is fully listed; ``stable_order`` sorts them by name instead.
+    With ``max_workers`` > 1 subfolders are processed in a thread pool; decoding, resizing and
+    encoding run in OpenCV/Pillow C code that releases the GIL, and OCR runs in a tesseract
+    subprocess. Worker log records are replayed on ``logger`` in folder order.
     """
 
     if logger is None:
         logger = _LOGGER
+    if resample not in _CV2_INTERPOLATION:
+        raise ValueError(f"不支持的重采样方式: {resample}")
 
     stats = AdjustmentStats()
     if not root_dir.exists() or not root_dir.is_dir():
         logger.warning("目录不存在或不是文件夹: %s", root_dir)
         return stats
 
-    subfolders = _iter_subfolders(root_dir)
-    for folder in subfolders:
-        stats.total_folders += 1
-        main_image_path = folder / "主图01.jpg"
-        if not main_image_path.exists():
-            logger.info("未找到主图: %s", main_image_path)
-            stats.missing_files += 1
+    terms = tuple(forbidden_terms) if forbidden_terms else None
+    ocr_cache = OcrCache.open(_default_ocr_cache_path(), logger) if terms else None
+    subfolders = _iter_subfolders(root_dir, stable_order=stable_order)
+    try:
+        if max_workers > 1:
+            worker = partial(
+                process_folder,
+                target_size=target_size,
+                forbidden_terms=terms,
+                ocr_languages=ocr_languages,
+                ocr_cache=ocr_cache,
+                resample=resample,
+                ocr_always=ocr_always,
+                stable_order=stable_order,
+            )
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for result in executor.map(worker, subfolders):
+                    for level, message in result.records:
+                        logger.log(level, "%s", message)
+                    stats.merge(result.stats)
         else:
-            try:
-                _process_main_image(
-                    main_image_path,
+            for folder in subfolders:
+                _process_folder(
+                    folder,
                     target_size,
                     logger=logger,
                     stats=stats,
-                    forbidden_terms=forbidden_terms,
+                    forbidden_terms=terms,
                     ocr_languages=ocr_languages,
+                    ocr_cache=ocr_cache,
+                    resample=resample,
+                    ocr_always=ocr_always,
+                    stable_order=stable_order,
                 )
-            except Exception as exc:  # noqa: BLE001
-                stats.errors += 1
-                logger.error("处理失败: %s -> %s", main_image_path, exc, exc_info=exc)
-
-        if forbidden_terms:
-            try:
-                for image_path in _iter_supported_images(folder):
-                    if image_path == main_image_path:
-                        continue
-                    _process_additional_image(
-                        image_path,
-                        logger=logger,
-                        stats=stats,
-                        forbidden_terms=forbidden_terms,
-                        ocr_languages=ocr_languages,
-                    )
-            except Exception as exc:  # noqa: BLE001
-                stats.errors += 1
-                logger.error("扫描目录图片失败: %s -> %s", folder, exc, exc_info=exc)
+    finally:
+        if ocr_cache is not None:
+            ocr_cache.close()
 
     logger.info(
         "统计: 总目录=%s, 检查图片=%s, 调整=%s, 删除=%s, 未找到=%s, 异常=%s",
@@ -99,16 +172,248 @@ def ensure_main_image_size(
     return stats
 
 
-def _iter_subfolders(root_dir: Path) -> Iterator[Path]:
-    for child in sorted(root_dir.iterdir()):
-        if child.is_dir():
-            yield child
+class OcrCache:
+    """Disk-persisted OCR text keyed by image content hash and OCR languages.
+
+    One connection is shared by the folder workers and guarded by a lock; WAL mode lets
+    a second run (for example the GUI and CLI at once) use the same file concurrently.
+    A database error during lookups or writes (such as "database is locked") is logged once
+    and the rest of the run continues without the cache.
+    """
+
+    def __init__(self, db_path: Path, logger: logging.Logger | None = None) -> None:
+        self._logger = logger or _LOGGER
+        self._disabled = False
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_text ("
+            "digest TEXT NOT NULL, languages TEXT NOT NULL, text TEXT NOT NULL, "
+            "PRIMARY KEY (digest, languages))"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def open(cls, db_path: Path, logger: logging.Logger) -> OcrCache | None:
+        """Open the cache, returning ``None`` (OCR without caching) when the file is unusable."""
+
+        try:
+            db_path.parent.mkdir(parents=True, exist_ok=True)
+            return cls(db_path, logger)
+        except (OSError, sqlite3.Error) as exc:
+            logger.warning("无法打开 OCR 缓存，将不使用缓存: %s -> %s", db_path, exc)
+            return None
+
+    def get(self, digest: str, languages: str) -> str | None:
+        with self._lock:
+            if self._disabled:
+                return None
+            try:
+                row = self._conn.execute(
+                    "SELECT text FROM ocr_text WHERE digest = ? AND languages = ?",
+                    (digest, languages),
+                ).fetchone()
+            except sqlite3.Error as exc:
+                self._disable(exc)
+                return None
+        return row[0] if row else None
+
+    def put_many(self, entries: Sequence[tuple[str, str, str]]) -> None:
+        """Store ``(digest, languages, text)`` rows in one transaction."""
+
+        if not entries:
+            return
+        with self._lock:
+            if self._disabled:
+                return
+            try:
+                self._conn.executemany("INSERT OR REPLACE INTO ocr_text VALUES (?, ?, ?)", entries)
+                self._conn.commit()
+            except sqlite3.Error as exc:
+                self._disable(exc)
+
+    def _disable(self, exc: sqlite3.Error) -> None:
+        """Stop using the cache for the rest of the run; the caller holds ``_lock``."""
+
+        self._disabled = True
+        try:
+            self._conn.rollback()
+        except sqlite3.Error:
+            pass
+        self._logger.warning("OCR 缓存读写失败，本次运行不再使用缓存: %s", exc)
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def _default_ocr_cache_path() -> Path:
+    """Per-user cache file, so runs never leave files in the product folders they clean."""
+
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local"
+    else:
+        base = os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache"
+    return Path(base) / "image_automation" / _OCR_CACHE_NAME
+
+
+def _file_digest(path: Path) -> str:
+    with path.open("rb") as handle:
+        return hashlib.file_digest(handle, partial(hashlib.blake2b, digest_size=16)).hexdigest()
+
+
+@dataclass(slots=True)
+class FolderResult:
+    """Result of processing one subfolder in a pool worker."""
+
+    stats: AdjustmentStats
+    records: list[tuple[int, str]] = field(default_factory=list)
+
+
+class _RecordCollector(logging.Handler):
+    """Collect formatted log records so they can be replayed on the caller's logger."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.records: list[tuple[int, str]] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        message = record.getMessage()
+        if record.exc_info:
+            message = f"{message}\n{logging.Formatter().formatException(record.exc_info)}"
+        self.records.append((record.levelno, message))
+
+
+def process_folder(
+    folder: Path,
+    *,
+    target_size: int = 800,
+    forbidden_terms: Sequence[str] | None = None,
+    ocr_languages: str = "chi_sim+eng",
+    ocr_cache: OcrCache | None = None,
+    resample: int = _RESAMPLING.LANCZOS,
+    ocr_always: bool = False,
+    stable_order: bool = False,
+) -> FolderResult:
+    """Process a single subfolder with its own log collector; entry point for pool workers."""
+
+    collector = _RecordCollector()
+    # A private logger per call on purpose: folders run concurrently, so a shared getLogger()
+    # child would mix their collectors, and unique child names would stay registered forever.
+    # An unregistered logger has no parent, so records only reach this call's collector.
+    logger = logging.Logger(f"{__name__}.worker", level=logging.DEBUG)  # noqa: LOG001
+    logger.addHandler(collector)
+
+    stats = AdjustmentStats()
+    _process_folder(
+        folder,
+        target_size,
+        logger=logger,
+        stats=stats,
+        forbidden_terms=forbidden_terms,
+        ocr_languages=ocr_languages,
+        ocr_cache=ocr_cache,
+        resample=resample,
+        ocr_always=ocr_always,
+        stable_order=stable_order,
+    )
+    return FolderResult(stats=stats, records=collector.records)
+
 
+def _process_folder(
+    folder: Path,
+    target_size: int,
+    *,
+    logger: logging.Logger,
+    stats: AdjustmentStats,
+    forbidden_terms: Sequence[str] | None,
+    ocr_languages: str,
+    ocr_cache: OcrCache | None = None,
+    resample: int = _RESAMPLING.LANCZOS,
+    ocr_always: bool = False,
+    stable_order: bool = False,
+) -> None:
+    stats.total_folders += 1
+    main_image_path = folder / "主图01.jpg"
+    main_exists = main_image_path.exists()
 
-def _iter_supported_images(folder: Path) -> Iterator[Path]:
-    for child in sorted(folder.iterdir()):
-        if child.is_file() and child.suffix.lower() in _SUPPORTED_EXTENSIONS:
-            yield child
+    additional_images: list[Path] = []
+    texts: dict[Path, str | None] = {}
+    if forbidden_terms:
+        try:
+            additional_images = [
+                path for path in _iter_supported_images(folder, stable_order=stable_order) if path != main_image_path
+            ]
+        except Exception as exc:  # noqa: BLE001
+            stats.errors += 1
+            logger.error("扫描目录图片失败: %s -> %s", folder, exc, exc_info=exc)
+        # One tesseract run covers the whole folder instead of one process per image.
+        ocr_paths = ([main_image_path] if main_exists else []) + additional_images
+        try:
+            texts = _extract_texts(
+                ocr_paths, ocr_languages, logger, cache=ocr_cache, skip_blank=not ocr_always
+            )
+        except Exception as exc:  # noqa: BLE001
+            stats.errors += 1
+            logger.error("文字识别失败: %s -> %s", folder, exc, exc_info=exc)
+
+    if not main_exists:
+        logger.info("未找到主图: %s", main_image_path)
+        stats.missing_files += 1
+    else:
+        try:
+            _process_main_image(
+                main_image_path,
+                target_size,
+                logger=logger,
+                stats=stats,
+                forbidden_terms=forbidden_terms,
+                ocr_text=texts.get(main_image_path),
+                resample=resample,
+            )
+        except Exception as exc:  # noqa: BLE001
+            stats.errors += 1
+            logger.error("处理失败: %s -> %s", main_image_path, exc, exc_info=exc)
+
+    if forbidden_terms:
+        try:
+            for image_path in additional_images:
+                _process_additional_image(
+                    image_path,
+                    logger=logger,
+                    stats=stats,
+                    forbidden_terms=forbidden_terms,
+                    ocr_text=texts.get(image_path),
+                )
+        except Exception as exc:  # noqa: BLE001
+            stats.errors += 1
+            logger.error("扫描目录图片失败: %s -> %s", folder, exc, exc_info=exc)
+
+
+def _iter_subfolders(root_dir: Path, *, stable_order: bool = False) -> Iterator[Path]:
+    # DirEntry.is_dir() uses the type reported by the directory read, avoiding a stat per child.
+    with os.scandir(root_dir) as entries:
+        folders = (entry for entry in entries if entry.is_dir())
+        if stable_order:
+            folders = iter(sorted(folders, key=attrgetter("name")))
+        for entry in folders:
+            yield Path(entry.path)
+
+
+def _iter_supported_images(folder: Path, *, stable_order: bool = False) -> Iterator[Path]:
+    # Filter on the entry name first so only image files pay for the DirEntry type check.
+    with os.scandir(folder) as entries:
+        images = (
+            entry
+            for entry in entries
+            if os.path.splitext(entry.name)[1].lower() in _SUPPORTED_EXTENSIONS and entry.is_file()
+        )
+        if stable_order:
+            images = iter(sorted(images, key=attrgetter("name")))
+        for entry in images:
+            yield Path(entry.path)
 
 
 def _process_main_image(
@@ -118,33 +423,157 @@ def _process_main_image(
     logger: logging.Logger,
     stats: AdjustmentStats,
     forbidden_terms: Sequence[str] | None,
-    ocr_languages: str,
+    ocr_text: str | None,
+    resample: int = _RESAMPLING.LANCZOS,
 ) -> None:
     delete_after_close = False
 
+    if not forbidden_terms:
+        # Without OCR a compliant image is decided from a few header bytes, skipping Pillow entirely.
+        size = _read_dimensions(target_path)
+        if size is not None and size[0] == size[1] >= target_size:
+            stats.inspected_files += 1
+            logger.info("主图尺寸合规，跳过: %s (%sx%s)", target_path, *size)
+            return
+
     with Image.open(target_path) as image:
         stats.inspected_files += 1
-        if forbidden_terms and _should_delete(image, forbidden_terms, ocr_languages, logger):
+        if forbidden_terms and _should_delete(ocr_text, forbidden_terms):
             delete_after_close = True
         else:
+            # ``size`` comes from the header; no pixel data is decoded for compliant images.
             width, height = image.size
-            if width == height and width >= target_size and height >= target_size:
+            if width == height >= target_size:
                 logger.info("主图尺寸合规，跳过: %s (%sx%s)", target_path, width, height)
                 return
-
-            logger.info("调整主图: %s (原尺寸 %sx%s)", target_path, width, height)
-
-            resized = image.resize((target_size, target_size), _RESAMPLING.LANCZOS)
-            resized.save(target_path, format=image.format or "JPEG")
-            resized.close()
-            stats.adjusted_files += 1
-            logger.info("完成尺寸调整: %s -> %sx%s", target_path, target_size, target_size)
-            return
+            image_format = image.format or "JPEG"
+            image_mode = image.mode
 
     if delete_after_close:
         logger.info("主图检测到敏感词，删除: %s", target_path)
         _delete_image(target_path, logger)
         stats.deleted_files += 1
+        return
+
+    logger.info("调整主图: %s (原尺寸 %sx%s)", target_path, width, height)
+    _resize_in_place(target_path, target_size, image_format, image_mode, (width, height), resample)
+    stats.adjusted_files += 1
+    logger.info("完成尺寸调整: %s -> %sx%s", target_path, target_size, target_size)
+
+
+def _read_dimensions(path: Path) -> tuple[int, int] | None:
+    """Read ``(width, height)`` from a PNG IHDR or JPEG SOF header.
+
+    Returns ``None`` for anything unrecognised or malformed so the caller falls back to Pillow;
+    a wrong size would let a non-compliant image skip the resize.
+    """
+
+    with path.open("rb") as handle:
+        head = handle.read(24)
+        if head.startswith(_PNG_SIGNATURE) and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return width, height
+        if not head.startswith(b"\xff\xd8"):
+            return None
+        handle.seek(2)
+        while True:
+            if handle.read(1) != b"\xff":
+                return None
+            marker = handle.read(1)
+            # Any number of 0xFF fill bytes may precede a marker code.
+            while marker == b"\xff":
+                marker = handle.read(1)
+            if not marker:
+                return None
+            code = marker[0]
+            if code in _JPEG_STANDALONE_MARKERS:
+                continue
+            if code in (0x00, 0xD8, 0xD9, 0xDA):
+                # Stuffed byte, a second SOI, EOI or scan data before any frame header.
+                return None
+            length_field = handle.read(2)
+            if len(length_field) < 2:
+                return None
+            length = int.from_bytes(length_field, "big")
+            if length < 2:
+                return None
+            if code in _JPEG_SOF_MARKERS:
+                frame = handle.read(5)
+                if len(frame) < 5:
+                    return None
+                height, width = struct.unpack(">HH", frame[1:5])
+                # A zero height is defined later by a DNL marker; let Pillow handle it.
+                return (width, height) if width and height else None
+            handle.seek(length - 2, os.SEEK_CUR)
+
+
+def _resize_in_place(
+    target_path: Path,
+    target_size: int,
+    image_format: str,
+    image_mode: str,
+    source_size: tuple[int, int],
+    resample: int = _RESAMPLING.LANCZOS,
+) -> None:
+    """Resize the file to ``target_size`` squared and overwrite it in its original format.
+
+    JPEG and PNG in plain grey/RGB(A) modes are decoded, resized and re-encoded with OpenCV,
+    whose C routines release the GIL; any other format or mode is handled by Pillow.
+    """
+
+    if image_mode in _CV2_RESIZE_MODES.get(image_format, ()):
+        _resize_with_cv2(target_path, target_size, image_format, image_mode, source_size, resample)
+        return
+
+    with Image.open(target_path) as image:
+        image.load()
+        resized = image.resize((target_size, target_size), resample)
+    resized.save(target_path, format=image_format)
+
+
+def _resize_with_cv2(
+    target_path: Path,
+    target_size: int,
+    image_format: str,
+    image_mode: str,
+    source_size: tuple[int, int],
+    resample: int,
+) -> None:
+    """Decode, resize and re-encode with OpenCV, keeping the channel layout.
+
+    Bytes go through ``np.fromfile``/``tofile`` so non-ASCII paths such as 主图01.jpg
+    also work on Windows, where ``cv2.imread`` cannot open them. Large JPEGs are decoded
+    at a reduced scale (libjpeg DCT scaling) as long as the result still covers ``target_size``.
+    """
+
+    buffer = np.fromfile(target_path, dtype=np.uint8)
+    if image_format == "PNG":
+        flags = cv2.IMREAD_UNCHANGED
+    else:
+        flags = _jpeg_decode_flags(min(source_size), target_size, grayscale=image_mode == "L")
+    array = cv2.imdecode(buffer, flags)
+    if array is None:
+        raise OSError(f"无法解码图片: {target_path}")
+
+    resized = cv2.resize(array, (target_size, target_size), interpolation=_CV2_INTERPOLATION[resample])
+    if image_format == "PNG":
+        ok, encoded = cv2.imencode(".png", resized)
+    else:
+        ok, encoded = cv2.imencode(".jpg", resized, [cv2.IMWRITE_JPEG_QUALITY, _JPEG_QUALITY])
+    if not ok:
+        raise OSError(f"无法编码图片: {target_path}")
+    encoded.tofile(target_path)
+
+
+def _jpeg_decode_flags(min_side: int, target_size: int, *, grayscale: bool = False) -> int:
+    """Pick the largest JPEG decode reduction that keeps the short side >= ``target_size``."""
+
+    # IMREAD_UNCHANGED never applied EXIF orientation; keep it that way for the reduced modes.
+    for factor, colour_flag, grayscale_flag in _JPEG_REDUCED_FLAGS:
+        if min_side // factor >= target_size:
+            return (grayscale_flag if grayscale else colour_flag) | cv2.IMREAD_IGNORE_ORIENTATION
+    full_flag = cv2.IMREAD_GRAYSCALE if grayscale else cv2.IMREAD_COLOR
+    return full_flag | cv2.IMREAD_IGNORE_ORIENTATION
 
 
 def _process_additional_image(
@@ -153,12 +582,14 @@ def _process_additional_image(
     logger: logging.Logger,
     stats: AdjustmentStats,
     forbidden_terms: Sequence[str] | None,
-    ocr_languages: str,
+    ocr_text: str | None,
 ) -> None:
     delete_after_close = False
-    with Image.open(target_path) as image:
+    # Opened only as a readability probe: OCR leaves unreadable files out of ``ocr_text``,
+    # and the error raised here is what gets them reported and counted by the caller.
+    with Image.open(target_path):
         stats.inspected_files += 1
-        if forbidden_terms and _should_delete(image, forbidden_terms, ocr_languages, logger):
+        if forbidden_terms and _should_delete(ocr_text, forbidden_terms):
             delete_after_close = True
 
     if delete_after_close:
@@ -171,15 +602,82 @@ def _process_additional_image(
 
 _PYTESSERACT = None
 _OCR_AVAILABLE: bool | None = None
+_TESSEROCR = None
+_TESSEROCR_AVAILABLE: bool | None = None
+# Language sets whose traineddata failed to load; other language sets may still work.
+_TESSEROCR_FAILED_LANGUAGES: set[str] = set()
+# tesserocr API objects are not thread-safe: each folder worker thread keeps its own per language set.
+_TESSEROCR_LOCAL = threading.local()
 
 
-def _extract_text(image: Image.Image, languages: str, logger: logging.Logger) -> str | None:
-    """Run OCR on the given image and return the extracted text when possible."""
+def _tesserocr_api(languages: str, logger: logging.Logger) -> Any:
+    """Return this thread's in-process tesserocr API, or ``None`` when tesserocr is unavailable."""
+
+    global _TESSEROCR, _TESSEROCR_AVAILABLE
+
+    if _TESSEROCR_AVAILABLE is False or languages in _TESSEROCR_FAILED_LANGUAGES:
+        return None
+
+    if _TESSEROCR is None:
+        try:
+            import tesserocr  # type: ignore[import-not-found]
+        except ImportError:
+            _TESSEROCR_AVAILABLE = False
+            return None
+        _TESSEROCR = tesserocr
+        _TESSEROCR_AVAILABLE = True
+
+    apis = getattr(_TESSEROCR_LOCAL, "apis", None)
+    if apis is None:
+        apis = _TESSEROCR_LOCAL.apis = {}
+    api = apis.get(languages)
+    if api is None:
+        try:
+            api = _TESSEROCR.PyTessBaseAPI(lang=languages, psm=_TESSEROCR.PSM.SINGLE_BLOCK)
+        except RuntimeError as exc:
+            logger.warning("tesserocr 初始化失败（%s），改用 tesseract 命令行: %s", languages, exc)
+            _TESSEROCR_FAILED_LANGUAGES.add(languages)
+            return None
+        apis[languages] = api
+    return api
+
+
+def _ocr_in_process(
+    api: Any, paths: Sequence[Path], logger: logging.Logger
+) -> dict[Path, str | None]:
+    """OCR with a loaded tesserocr API; the language model stays in memory between images.
+
+    Failures are handled per image like the pytesseract path: unreadable files are left out
+    and recognition errors are logged and recorded as ``None``.
+    """
+
+    texts: dict[Path, str | None] = {}
+    for path in paths:
+        try:
+            with Image.open(path) as image:
+                ocr_source, cleanup = _prepare_image_for_ocr(image)
+        except Exception as exc:  # noqa: BLE001
+            logger.debug("无法读取图片，跳过 OCR: %s (%s)", path, exc)
+            continue
+        try:
+            api.SetImage(ocr_source)
+            texts[path] = api.GetUTF8Text()
+        except RuntimeError as exc:
+            logger.error("OCR 识别失败 %s: %s", path, exc)
+            texts[path] = None
+        finally:
+            for temp_image in cleanup:
+                temp_image.close()
+    return texts
+
+
+def _load_pytesseract(logger: logging.Logger) -> bool:
+    """Import pytesseract once; return whether OCR can be attempted."""
 
     global _PYTESSERACT, _OCR_AVAILABLE
 
     if _OCR_AVAILABLE is False:
-        return None
+        return False
 
     if _PYTESSERACT is None:
         try:
@@ -187,9 +685,173 @@ def _extract_text(image: Image.Image, languages: str, logger: logging.Logger) ->
         except ImportError:
             logger.error("未安装 pytesseract 库，无法执行文字识别。")
             _OCR_AVAILABLE = False
-            return None
+            return False
         _PYTESSERACT = pytesseract
         _OCR_AVAILABLE = True
+    return True
+
+
+def _extract_texts(
+    paths: Sequence[Path],
+    languages: str,
+    logger: logging.Logger,
+    *,
+    cache: OcrCache | None = None,
+    skip_blank: bool = True,
+) -> dict[Path, str | None]:
+    """Return OCR text keyed by path.
+
+    Unchanged files are served from ``cache`` when given; with ``skip_blank`` near-uniform
+    images get empty text without OCR. Blank results are not cached so ``ocr_always`` runs
+    still see real OCR output.
+    """
+
+    texts: dict[Path, str | None] = {}
+    digests: dict[Path, str] = {}
+    if cache is not None:
+        for path in paths:
+            try:
+                digests[path] = digest = _file_digest(path)
+            except OSError:
+                continue
+            cached = cache.get(digest, languages)
+            if cached is not None:
+                texts[path] = cached
+
+    pending = [path for path in paths if path not in texts]
+    if skip_blank:
+        for path in pending:
+            if _looks_text_free(path):
+                texts[path] = ""
+        pending = [path for path in pending if path not in texts]
+
+    fresh = _ocr_images(pending, languages, logger)
+    texts.update(fresh)
+    if cache is not None:
+        cache.put_many(
+            [(digests[path], languages, text) for path, text in fresh.items() if text is not None and path in digests]
+        )
+    return texts
+
+
+def _looks_text_free(path: Path) -> bool:
+    """Cheap pre-check: a tiny grayscale probe with almost no contrast cannot hold legible text."""
+
+    try:
+        with Image.open(path) as image:
+            # JPEG decodes straight at a reduced DCT scale; other formats decode normally.
+            image.draft("L", (_INK_PROBE_SIZE, _INK_PROBE_SIZE))
+            with image.convert("L") as gray:
+                probe = gray.resize((_INK_PROBE_SIZE, _INK_PROBE_SIZE), _RESAMPLING.BILINEAR)
+    except Exception:  # noqa: BLE001
+        return False
+    with probe:
+        return int(np.ptp(np.asarray(probe))) < _INK_MIN_CONTRAST
+
+
+def _ocr_images(paths: Sequence[Path], languages: str, logger: logging.Logger) -> dict[Path, str | None]:
+    """OCR several images and return the text keyed by path.
+
+    The optional ``tesserocr`` bindings are preferred: they keep the model loaded in-process.
+    Otherwise a single tesseract process handles the batch: each preprocessed image is written
+    as an uncompressed BMP and tesseract reads them all from one list file, so process startup
+    and language model loading are paid once per batch. Images that cannot be opened are left
+    out; the caller reports them when it opens them itself. A single image goes through
+    pytesseract directly.
+    """
+
+    if not paths:
+        return {}
+
+    api = _tesserocr_api(languages, logger)
+    if api is not None:
+        return _ocr_in_process(api, paths, logger)
+
+    if not _load_pytesseract(logger):
+        return {}
+
+    if len(paths) == 1:
+        try:
+            with Image.open(paths[0]) as image:
+                return {paths[0]: _extract_text(image, languages, logger)}
+        except Exception:  # noqa: BLE001
+            return {}
+
+    with tempfile.TemporaryDirectory(prefix="ocr-") as temp_dir:
+        work_dir = Path(temp_dir)
+        frame_paths = [work_dir / f"{index}.bmp" for index in range(len(paths))]
+        # Decode, preprocess and BMP encoding release the GIL, so frames are prepared in parallel.
+        with ThreadPoolExecutor(max_workers=min(_OCR_PREPARE_WORKERS, len(paths))) as executor:
+            written = list(executor.map(_write_ocr_frame, paths, frame_paths))
+        listed = [(path, frame) for path, frame, ok in zip(paths, frame_paths, written) if ok]
+        if not listed:
+            return {}
+
+        list_file = work_dir / "images.txt"
+        list_file.write_text("".join(f"{frame}\n" for _, frame in listed), encoding="utf-8")
+        output = _run_tesseract(list_file, languages, logger)
+
+    if output is None:
+        return {}
+    # The text renderer terminates every page with a form feed.
+    pages = output.split("\f")
+    if len(pages) < len(listed):
+        logger.warning("OCR 批量结果数量不符 (%s/%s)，逐张重新识别。", len(pages), len(listed))
+        texts: dict[Path, str | None] = {}
+        for path, _ in listed:
+            try:
+                with Image.open(path) as image:
+                    texts[path] = _extract_text(image, languages, logger)
+            except Exception as exc:  # noqa: BLE001
+                logger.debug("无法读取图片，跳过 OCR: %s (%s)", path, exc)
+                texts[path] = None
+        return texts
+    return {path: page for (path, _), page in zip(listed, pages)}
+
+
+def _write_ocr_frame(path: Path, frame_path: Path) -> bool:
+    """Write the preprocessed OCR input for ``path``; ``False`` when the image cannot be read."""
+
+    try:
+        with Image.open(path) as image:
+            ocr_source, cleanup = _prepare_image_for_ocr(image)
+            try:
+                ocr_source.save(frame_path, format="BMP")
+            finally:
+                for temp_image in cleanup:
+                    temp_image.close()
+    except Exception:  # noqa: BLE001
+        return False
+    return True
+
+
+def _run_tesseract(list_file: Path, languages: str, logger: logging.Logger) -> str | None:
+    """Run the tesseract CLI on a list file and return its plain-text stdout."""
+
+    global _OCR_AVAILABLE
+
+    assert _PYTESSERACT is not None
+    tesseract_cmd = getattr(getattr(_PYTESSERACT, "pytesseract", None), "tesseract_cmd", "tesseract")
+    command = [tesseract_cmd, str(list_file), "stdout", "-l", languages, "--psm", "6"]
+    try:
+        completed = subprocess.run(command, capture_output=True, check=False, creationflags=_SUBPROCESS_FLAGS)
+    except OSError as exc:
+        _OCR_AVAILABLE = False
+        logger.error("未找到 Tesseract 可执行文件: %s", exc)
+        return None
+    if completed.returncode != 0:
+        logger.error("OCR 识别失败: %s", completed.stderr.decode("utf-8", errors="replace").strip())
+        return None
+    return completed.stdout.decode("utf-8", errors="replace")
+
+
+def _extract_text(image: Image.Image, languages: str, logger: logging.Logger) -> str | None:
+    """Run OCR on the given image and return the extracted text when possible."""
+
+    global _OCR_AVAILABLE
+
+    if not _load_pytesseract(logger):
+        return None
 
     assert _PYTESSERACT is not None
 
@@ -212,63 +874,57 @@ def _extract_text(image: Image.Image, languages: str, logger: logging.Logger) ->
 
 
 def _prepare_image_for_ocr(image: Image.Image) -> tuple[Image.Image, list[Image.Image]]:
-    """Apply light preprocessing to improve OCR accuracy."""
+    """Apply light preprocessing to improve OCR accuracy.
 
-    cleanup: list[Image.Image] = []
+    Returns the OCR input plus the images the caller must close; ``image`` itself is never
+    included. Grayscale conversion happens first so upscaling works on a single channel.
+    """
 
-    if image.mode in ("RGB", "RGBA", "L"):
-        working = image.copy()
+    if image.mode == "L":
+        gray = image
+    elif image.mode in ("RGB", "RGBA"):
+        gray = image.convert("L")
     else:
-        working = image.convert("RGB")
-    cleanup.append(working)
+        with image.convert("RGB") as rgb:
+            gray = rgb.convert("L")
 
-    min_dim = min(working.size)
+    min_dim = min(gray.size)
     if min_dim < 600:
         scale = min(600 / max(min_dim, 1), 2.0)
         if scale > 1.0:
-            new_size = (int(working.width * scale), int(working.height * scale))
-            resized = working.resize(new_size, _RESAMPLING.LANCZOS)
-            cleanup.append(resized)
-            working.close()
-            working = resized
-
-    gray = working.convert("L")
-    cleanup.append(gray)
+            new_size = (int(gray.width * scale), int(gray.height * scale))
+            resized = gray.resize(new_size, _RESAMPLING.LANCZOS)
+            if gray is not image:
+                gray.close()
+            gray = resized
 
     contrasted = ImageOps.autocontrast(gray)
-    cleanup.append(contrasted)
-
-    return contrasted, cleanup
+    if gray is not image:
+        gray.close()
+    return contrasted, [contrasted]
 
 
-def _should_delete(
-    image: Image.Image,
-    forbidden_terms: Sequence[str],
-    languages: str,
-    logger: logging.Logger,
-) -> bool:
-    text_content = _extract_text(image, languages, logger)
+def _should_delete(text_content: str | None, forbidden_terms: Sequence[str]) -> bool:
     if not text_content:
         return False
     return _contains_forbidden_terms(text_content, forbidden_terms)
 
 
 def _contains_forbidden_terms(text: str, terms: Sequence[str]) -> bool:
-    normalized = (
-        text.replace(" ", "")
-        .replace("\n", "")
-        .replace("\r", "")
-        .replace("\t", "")
-        .replace("\u3000", "")
-        .lower()
-    )
-    for term in terms:
-        candidate = term.strip()
-        if not candidate:
-            continue
-        if candidate.lower() in normalized:
-            return True
-    return False
+    normalized = text.translate(_OCR_WHITESPACE_TABLE).casefold()
+    matcher = _forbidden_terms_matcher(tuple(terms))
+    return matcher is not None and matcher.search(normalized) is not None
+
+
+@lru_cache(maxsize=8)
+def _forbidden_terms_matcher(terms: tuple[str, ...]) -> re.Pattern[str] | None:
+    """Compile the terms into one alternation so each OCR text is scanned once, not once per term."""
+
+    candidates = {term.strip().casefold() for term in terms}
+    candidates.discard("")
+    if not candidates:
+        return None
+    return re.compile("|".join(re.escape(term) for term in sorted(candidates)))
 
 
 def _delete_image(target_path: Path, logger: logging.Logger) -> None:
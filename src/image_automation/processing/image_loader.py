@@ -4,49 +4,101 @@ from __future__ import annotations
 
 import logging
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Optional, Tuple
 
-from PIL import Image, ImageOps, UnidentifiedImageError
+from PIL import ExifTags, Image, ImageOps, UnidentifiedImageError
 
 from image_automation.core.exceptions import ImageAutomationError
 
 LOGGER = logging.getLogger(__name__)
 
+DraftSizeHint = Callable[[Tuple[int, int]], Optional[Tuple[int, int]]]
+
+# EXIF 方向 5-8 表示图像需旋转 90°，显示尺寸与存储尺寸宽高互换。
+_TRANSPOSED_ORIENTATIONS = frozenset({5, 6, 7, 8})
 
 class ImageLoadingError(ImageAutomationError):
     """图片加载失败。"""
 
 
-def load_image(path: Path) -> Image.Image:
+class ImageTooLargeError(ImageLoadingError):
+    """源图文件或解码尺寸超出上限。"""
+
+
+def load_image(
+    path: Path,
+    *,
+    draft_size: Optional[DraftSizeHint] = None,
+    max_bytes: Optional[int] = None,
+    max_pixels: Optional[int] = None,
+) -> Image.Image:
     """加载单张图片并执行 EXIF 旋转与模式归一化。
 
+    ``draft_size`` 接收按 EXIF 方向校正后的原始尺寸，返回后续处理所需的最小尺寸时，
+    JPEG 会直接以 1/2、1/4 或 1/8 比例解码；返回 ``None`` 则完整解码。
+    文件大小超过 ``max_bytes`` 或（缩小解码后的）像素数超过 ``max_pixels`` 时抛出
+    ``ImageTooLargeError`` 且不解码，避免个别超大文件撑爆工作进程内存；``None`` 表示不限制。
     返回值为新的 Image 对象，调用者负责关闭。
     """
 
     try:
+        if max_bytes is not None:
+            file_size = path.stat().st_size
+            if file_size > max_bytes:
+                raise ImageTooLargeError(
+                    f"文件过大（{file_size / 1024 / 1024:.1f} MB，上限 {max_bytes / 1024 / 1024:.1f} MB），"
+                    f"已跳过: {path}"
+                )
+
         with Image.open(path) as img:
+            if draft_size is not None and img.format == "JPEG":
+                _apply_draft(img, draft_size)
+            # 缩小解码后再检查像素数，只读取了文件头，尚未分配像素缓冲。
+            width, height = img.size
+            if max_pixels is not None and width * height > max_pixels:
+                raise ImageTooLargeError(
+                    f"图像尺寸过大（{width}×{height}，上限 {max_pixels} 像素），已跳过: {path}"
+                )
             img.load()
 
-            # EXIF Orientation 校正
-            img = ImageOps.exif_transpose(img)
+            # EXIF Orientation 校正；原地执行，像素已载入内存，无需再复制
+            ImageOps.exif_transpose(img, in_place=True)
 
-            # 统一转换到 RGB
+            # 统一转换到 RGB（转换本身会生成新图像），随即释放原始解码缓冲
             if img.mode != "RGB":
-                img = _convert_to_rgb(img)
+                converted = _convert_to_rgb(img)
+                img.close()
+                return converted
 
-            return img.copy()
+            return img
+    except Image.DecompressionBombError as exc:
+        raise ImageTooLargeError(f"图像尺寸过大，已跳过: {path}") from exc
     except (UnidentifiedImageError, OSError) as exc:
         LOGGER.debug("无法识别图像文件 %s: %s", path, exc)
         raise ImageLoadingError(f"无法加载图像: {path}") from exc
 
 
+def _apply_draft(img: Image.Image, draft_size: DraftSizeHint) -> None:
+    """在解码前按需求尺寸设置 JPEG 缩小解码，只读取文件头与 EXIF。"""
+
+    transposed = img.getexif().get(ExifTags.Base.Orientation) in _TRANSPOSED_ORIENTATIONS
+    width, height = img.size
+    requested = draft_size((height, width) if transposed else (width, height))
+    if requested is None:
+        return
+    if transposed:
+        requested = (requested[1], requested[0])
+    img.draft(None, requested)
+
+
 def _convert_to_rgb(img: Image.Image) -> Image.Image:
     """将任意模式图像转换为 RGB。"""
 
     if img.mode in {"RGBA", "LA"}:
         # 保留 Alpha 信息，通过白色背景混合生成 RGB。
         background = Image.new("RGB", img.size, (255, 255, 255))
-        background.paste(img.convert("RGBA"), mask=img.split()[-1])
+        # paste 可直接把 RGBA/LA 贴到 RGB 画布上，无需先复制一份 RGBA。
+        background.paste(img, mask=img.getchannel("A"))
         return background
 
     if img.mode == "P":
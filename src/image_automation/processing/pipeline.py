@@ -2,25 +2,42 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
+import os
 import random
-from concurrent.futures import ProcessPoolExecutor, as_completed
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Callable, Optional, Set
 
 from image_automation.core.config import JobConfig
 from image_automation.core.models import BatchResult, FileOutcome
 from image_automation.core.output_manager import OutputManager
-from image_automation.core.progress import ProgressUpdate
-from image_automation.core.report import write_csv_report
+from image_automation.core.progress import (
+    PROGRESS_LEVEL_MESSAGE,
+    PROGRESS_LEVEL_TICK,
+    ProgressAggregator,
+    ProgressUpdate,
+)
+from image_automation.core.report import ReportWriter
 from image_automation.core.scanner import collect_source_images
-from image_automation.processing.worker import ProcessingTask, run_task
+from image_automation.processing.worker import ProcessingTask, run_task, run_task_safely
 
 LOGGER = logging.getLogger(__name__)
 
 
 ProgressCallback = Optional[Callable[[ProgressUpdate], None]]
 
+# 进程级共享的工作进程池：多次调用 process_batch 时复用已启动并完成导入的工作进程。
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_WORKERS = 0
+_POOL_LOCK = threading.Lock()
+
+# 单个工作进程的内存预算：源图、风格化结果、防检测结果与编码缓冲区同时驻留时的保守估计。
+WORKER_MEMORY_BUDGET = 512 * 1024 * 1024
+
 
 def process_batch(config: JobConfig, progress_callback: ProgressCallback = None) -> BatchResult:
     """批量处理入口：扫描、并发执行风格化、防检测与输出。"""
@@ -38,92 +55,207 @@ def process_batch(config: JobConfig, progress_callback: ProgressCallback = None)
         _emit_progress(progress_callback, completed=0, total=0, message="没有需要处理的图片")
         return BatchResult(succeeded=successes, skipped=skipped, failed=failed)
 
+    aggregator = ProgressAggregator(progress_callback) if progress_callback else None
+    progress_callback = aggregator
     output_manager = OutputManager(config.output)
+    report = _open_report(config, output_manager)
     reserved_paths: Set[Path] = set()
     global_rng = random.Random(config.random_seed)
     tasks: list[ProcessingTask] = []
     completed = 0
 
-    for source in sources:
-        decision = output_manager.decide_destination(source, reserved_paths=reserved_paths)
-        if decision.action == "skip":
-            LOGGER.info("跳过输出（已存在）：%s", decision.destination)
-            skipped.append(
-                FileOutcome(
+    try:
+        for source in sources:
+            decision = output_manager.decide_destination(source, reserved_paths=reserved_paths)
+            if decision.action == "skip":
+                LOGGER.info("跳过输出（已存在）：%s", decision.destination)
+                outcome = FileOutcome(
                     source_path=source.source_path,
                     status="skip-existing",
                     output_path=decision.destination,
                     message=decision.note,
                 )
+                skipped.append(outcome)
+                _write_report_row(report, outcome)
+                completed += 1
+                _emit_progress(progress_callback, completed, total, f"跳过 {source.source_path.name}")
+                continue
+
+            assert decision.destination is not None
+            task_seed = global_rng.randint(0, 2**32 - 1)
+            tasks.append(
+                ProcessingTask(
+                    source_path=source.source_path,
+                    dest_path=decision.destination,
+                    decision_action=decision.action,
+                    decision_note=decision.note,
+                    styling=config.styling,
+                    anti_dedup=config.anti_dedup,
+                    random_seed=task_seed,
+                    validation=config.validation,
+                    max_source_bytes=config.max_source_bytes,
+                    max_source_pixels=config.max_source_pixels,
+                )
             )
-            completed += 1
-            _emit_progress(progress_callback, completed, total, f"跳过 {source.source_path.name}")
-            continue
-
-        assert decision.destination is not None
-        task_seed = global_rng.randint(0, 2**32 - 1)
-        tasks.append(
-            ProcessingTask(
-                source_path=source.source_path,
-                dest_path=decision.destination,
-                decision_action=decision.action,
-                decision_note=decision.note,
-                styling=config.styling,
-                anti_dedup=config.anti_dedup,
-                random_seed=task_seed,
-                validation=config.validation,
-            )
-        )
-
-    _emit_progress(progress_callback, completed, total, "开始执行处理任务")
-
-    if not tasks:
-        # 全部被跳过
-        _emit_progress(progress_callback, total, total, "全部文件已跳过")
-        result = BatchResult(succeeded=successes, skipped=skipped, failed=failed)
-        _write_report(config, output_manager, result)
-        return result
-
-    if config.max_workers <= 1:
-        for task in tasks:
-            outcome = run_task(task)
-            _record_outcome(outcome, successes, failed)
-            completed += 1
-            _emit_progress(progress_callback, completed, total, f"完成 {task.source_path.name}")
-    else:
-        with ProcessPoolExecutor(max_workers=config.max_workers) as executor:
-            future_map = {executor.submit(run_task, task): task for task in tasks}
-            for future in as_completed(future_map):
-                task = future_map[future]
-                try:
-                    outcome = future.result()
-                except Exception as exc:  # noqa: BLE001
-                    LOGGER.exception("任务执行异常：%s", exc)
+
+        _emit_progress(progress_callback, completed, total, "开始执行处理任务")
+
+        if not tasks:
+            # 全部被跳过
+            _emit_progress(progress_callback, total, total, "全部文件已跳过")
+            return BatchResult(succeeded=successes, skipped=skipped, failed=failed)
+
+        max_workers = _bounded_worker_count(config.max_workers)
+        if max_workers <= 1:
+            for task in tasks:
+                outcome = run_task(task)
+                _record_outcome(outcome, successes, skipped, failed)
+                _write_report_row(report, outcome)
+                completed += 1
+                _emit_progress(progress_callback, completed, total, _outcome_message(outcome))
+        else:
+            chunksize = _compute_chunksize(len(tasks), max_workers)
+            executor = _get_pool(max_workers)
+            finished = 0
+            try:
+                outcomes = executor.map(run_task_safely, tasks, chunksize=chunksize)
+                for outcome in outcomes:
+                    finished += 1
+                    _record_outcome(outcome, successes, skipped, failed)
+                    _write_report_row(report, outcome)
+                    completed += 1
+                    _emit_progress(progress_callback, completed, total, _outcome_message(outcome))
+            except BrokenProcessPool as exc:
+                # 工作进程被系统终止（如内存不足）时 run_task_safely 无从捕获：
+                # 尚未返回结果的任务全部记为失败，批处理照常返回汇总；进程池下次调用时重新创建。
+                LOGGER.error("工作进程异常退出，剩余 %d 个任务标记为失败：%s", len(tasks) - finished, exc)
+                shutdown_worker_pool()
+                for task in tasks[finished:]:
                     outcome = FileOutcome(
                         source_path=task.source_path,
                         status="error-worker",
-                        message=str(exc),
+                        message=str(exc) or "工作进程异常退出",
                     )
-                _record_outcome(outcome, successes, failed)
-                completed += 1
-                _emit_progress(progress_callback, completed, total, f"完成 {task.source_path.name}")
+                    _record_outcome(outcome, successes, skipped, failed)
+                    _write_report_row(report, outcome)
+                    completed += 1
+                    _emit_progress(progress_callback, completed, total, _outcome_message(outcome))
+    finally:
+        if report is not None:
+            report.close()
+        if aggregator is not None:
+            aggregator.flush()
 
     result = BatchResult(succeeded=successes, skipped=skipped, failed=failed)
-    _write_report(config, output_manager, result)
     _emit_progress(progress_callback, total, total, "处理完成")
     return result
 
 
-def _record_outcome(outcome: FileOutcome, successes: list[FileOutcome], failed: list[FileOutcome]) -> None:
+def shutdown_worker_pool() -> None:
+    """关闭共享的工作进程池。
+
+    解释器正常退出时会自动调用；在 ``multiprocessing.Process`` 子进程中运行批处理时，
+    子进程退出前必须显式调用，否则会一直等待空闲的工作进程。
+    """
+
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        pool, _POOL, _POOL_WORKERS = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(cancel_futures=True)
+
+
+atexit.register(shutdown_worker_pool)
+
+
+def _get_pool(max_workers: int) -> ProcessPoolExecutor:
+    """返回共享的工作进程池，进程数变化时重建。"""
+
+    global _POOL, _POOL_WORKERS
+    with _POOL_LOCK:
+        stale = None
+        if _POOL is None or _POOL_WORKERS != max_workers:
+            stale = _POOL
+            _POOL = ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker)
+            _POOL_WORKERS = max_workers
+        pool = _POOL
+    if stale is not None:
+        stale.shutdown()
+    return pool
+
+
+def _init_worker() -> None:
+    """工作进程启动时预先导入处理链依赖（OpenCV、NumPy、Pillow 插件），首个任务无需等待导入。"""
+
+    from PIL import Image
+
+    import image_automation.processing.worker  # noqa: F401
+
+    Image.init()
+
+
+def _bounded_worker_count(requested: int) -> int:
+    """按 CPU 核数与可用内存收紧并发进程数，避免大图批次并发时耗尽内存。
+
+    无法获取可用内存的平台只按 CPU 核数限制。
+    """
+
+    workers = min(max(1, requested), os.cpu_count() or 1)
+    available = _available_memory_bytes()
+    if available is not None:
+        workers = min(workers, max(1, available // WORKER_MEMORY_BUDGET))
+    if workers < requested:
+        LOGGER.info("并发进程数由 %d 调整为 %d（受 CPU 核数或可用内存限制）", requested, workers)
+    return workers
+
+
+def _available_memory_bytes() -> Optional[int]:
+    """返回可用内存字节数（Linux 的 MemAvailable，含可回收的页缓存）；无法获取时返回 None。
+
+    空闲内存（MemFree）不含页缓存，大批量读图后会远低于实际可用量，不能用作上限。
+    """
+
+    try:
+        with open("/proc/meminfo", encoding="ascii") as meminfo:
+            for line in meminfo:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    return None
+
+
+def _compute_chunksize(task_count: int, max_workers: int) -> int:
+    """按任务量切分批次，每个进程约分到 4 批，减少逐任务的序列化开销。"""
+
+    return max(1, task_count // (max(1, max_workers) * 4))
+
+
+def _record_outcome(
+    outcome: FileOutcome,
+    successes: list[FileOutcome],
+    skipped: list[FileOutcome],
+    failed: list[FileOutcome],
+) -> None:
     if outcome.status.startswith("processed"):
         successes.append(outcome)
-    elif outcome.status == "skip-existing":
-        # 理论上不会进入此分支（已在主进程处理），但保留以防未来扩展。
-        pass
+    elif outcome.status.startswith("skip-"):
+        # 工作进程主动跳过的文件（如超出尺寸上限）；已存在的输出在主进程中即已跳过。
+        skipped.append(outcome)
     else:
         failed.append(outcome)
 
 
+def _outcome_message(outcome: FileOutcome) -> Optional[str]:
+    """成功项只推进计数，跳过与失败项才附带消息。"""
+
+    if outcome.status.startswith("processed"):
+        return None
+    if outcome.status.startswith("skip-"):
+        return f"跳过 {outcome.source_path.name}: {outcome.status}"
+    return f"失败 {outcome.source_path.name}: {outcome.status}"
+
+
 def _emit_progress(
     callback: ProgressCallback,
     completed: int,
@@ -132,11 +264,24 @@ def _emit_progress(
 ) -> None:
     if not callback:
         return
-    callback(ProgressUpdate(total=total, completed=completed, message=message))
+    level = PROGRESS_LEVEL_MESSAGE if message else PROGRESS_LEVEL_TICK
+    callback(ProgressUpdate(total=total, completed=completed, message=message, level=level))
 
 
-def _write_report(config: JobConfig, output_manager: OutputManager, result: BatchResult) -> None:
+def _open_report(config: JobConfig, output_manager: OutputManager) -> Optional[ReportWriter]:
+    report = ReportWriter(output_manager.output_dir, config.report_filename)
+    try:
+        report.open()
+    except OSError as exc:
+        LOGGER.error("写入报告失败：%s", exc)
+        return None
+    return report
+
+
+def _write_report_row(report: Optional[ReportWriter], outcome: FileOutcome) -> None:
+    if report is None:
+        return
     try:
-        write_csv_report(result.all_outcomes(), output_manager.output_dir, config.report_filename)
+        report.write(outcome)
     except OSError as exc:
         LOGGER.error("写入报告失败：%s", exc)
@@ -3,75 +3,152 @@
 from __future__ import annotations
 
 import logging
-import math
+from functools import lru_cache
 from pathlib import Path
 
 from PIL import Image, ImageOps
 
+from image_automation.core import image_pool
 from image_automation.core.config import StylingConfig
 from image_automation.core.exceptions import InvalidConfigurationError
 from image_automation.utils.colors import parse_hex_color
 
 LOGGER = logging.getLogger(__name__)
 
-VALID_MODES = {"contain", "cover"}
+VALID_MODES = frozenset({"contain", "cover"})
+
+# 缩小解码时保留目标尺寸 2 倍的像素，LANCZOS 仍有足够的源数据。
+DRAFT_MARGIN = 2
 
 
 def apply_styling(image: Image.Image, config: StylingConfig) -> Image.Image:
-    """根据配置对图片执行尺寸规范化与边框合成。"""
+    """根据配置对图片执行尺寸规范化与边框合成。
+
+    无需任何处理时直接返回 ``image`` 本身（不复制），调用方需据此判断所有权。
+    """
 
     if config.mode not in VALID_MODES:
         raise InvalidConfigurationError(f"未知的尺寸模式: {config.mode}")
 
+    border = 0
+    if config.border_thickness and config.border_thickness > 0 and config.border_color:
+        border = config.border_thickness
+
     should_resize = _should_resize(image.size, config)
     if should_resize:
         target_size = _compute_target_size(config)
         if config.mode == "contain":
-            styled = _apply_contain(image, target_size, config.background_color)
+            # contain 模式直接在带边框的画布上合成，省去 ImageOps.expand 的整图复制。
+            styled = _apply_contain(
+                image,
+                target_size,
+                config.background_color,
+                border=border,
+                border_color=config.border_color,
+            )
+            border = 0
         else:
             styled = ImageOps.fit(image, target_size, Image.LANCZOS, centering=(0.5, 0.5))
     else:
-        styled = image.copy()
+        styled = image
 
-    if config.border_thickness and config.border_thickness > 0 and config.border_color:
+    if border:
         border_color = parse_hex_color(config.border_color)
-        styled = ImageOps.expand(styled, border=config.border_thickness, fill=border_color)
+        expanded = ImageOps.expand(styled, border=border, fill=border_color)
+        if styled is not image:
+            image_pool.release(styled)
+        styled = expanded
 
     if config.border_image:
-        styled = _overlay_border(styled, config.border_image)
+        if styled is image:
+            # 边框图会原地粘贴，不能改动调用方的原图。
+            styled = image.copy()
+        overlaid = _overlay_border(styled, config.border_image)
+        if overlaid is not styled:
+            image_pool.release(styled)
+        styled = overlaid
 
     return styled
 
 
-def _apply_contain(image: Image.Image, target_size: tuple[int, int], background: str) -> Image.Image:
-    """使用 contain 模式适配尺寸。"""
+def draft_size_for(size: tuple[int, int], config: StylingConfig) -> tuple[int, int] | None:
+    """返回解码阶段可缩小到的最小尺寸；图片无需缩放或配置无效时返回 ``None``。
+
+    供 ``load_image`` 的 ``draft_size`` 使用：只有确定会被缩放的图片才允许降分辨率解码，
+    已合规的图片保持原始分辨率输出。
+    """
+
+    if config.mode not in VALID_MODES or not _should_resize(size, config):
+        return None
+    try:
+        target_w, target_h = _compute_target_size(config)
+    except InvalidConfigurationError:
+        return None
+    return target_w * DRAFT_MARGIN, target_h * DRAFT_MARGIN
+
+
+def _apply_contain(
+    image: Image.Image,
+    target_size: tuple[int, int],
+    background: str,
+    *,
+    border: int = 0,
+    border_color: str | None = None,
+) -> Image.Image:
+    """使用 contain 模式适配尺寸；``border`` 大于 0 时画布四周额外留出纯色边框。"""
 
     background_color = parse_hex_color(background)
-    canvas = Image.new("RGB", target_size, background_color)
+    target_w, target_h = target_size
+    if border > 0 and border_color:
+        canvas = image_pool.acquire(
+            "RGB", (target_w + 2 * border, target_h + 2 * border), parse_hex_color(border_color)
+        )
+        canvas.paste(background_color, (border, border, border + target_w, border + target_h))
+    else:
+        border = 0
+        canvas = image_pool.acquire("RGB", target_size, background_color)
 
     resized = ImageOps.contain(image, target_size, Image.LANCZOS)
     offset = (
-        (target_size[0] - resized.width) // 2,
-        (target_size[1] - resized.height) // 2,
+        border + (target_w - resized.width) // 2,
+        border + (target_h - resized.height) // 2,
     )
     canvas.paste(resized, offset)
     return canvas
 
 
 def _overlay_border(styled: Image.Image, border_path: Path) -> Image.Image:
-    """将提供的 PNG 边框叠加到结果图像上。"""
+    """将提供的 PNG 边框叠加到结果图像上。
+
+    结果图像不透明，按边框 Alpha 作为蒙版直接贴到原图上与 ``alpha_composite`` 等价，
+    省去 RGBA 转换与合成产生的整图副本。
+    """
+
+    border = _load_border(border_path, styled.size)
+    if border is None:
+        return styled
+
+    border_rgb, border_alpha = border
+    if styled.mode != "RGB":
+        # 转换出的新图像由调用方负责归还原图。
+        styled = styled.convert("RGB")
+    styled.paste(border_rgb, mask=border_alpha)
+    return styled
+
+
+@lru_cache(maxsize=4)
+def _load_border(border_path: Path, size: tuple[int, int]) -> tuple[Image.Image, Image.Image] | None:
+    """加载并缩放边框，拆分为 RGB 与 Alpha 两部分；同一批次的输出尺寸通常一致，结果按尺寸缓存。"""
 
     try:
         with Image.open(border_path) as border_img:
             border_rgba = border_img.convert("RGBA")
     except OSError as exc:
         LOGGER.warning("无法加载边框图片 %s: %s", border_path, exc)
-        return styled
+        return None
 
-    border_rgba = border_rgba.resize(styled.size, Image.LANCZOS)
-    base = styled.convert("RGBA")
-    combined = Image.alpha_composite(base, border_rgba)
-    return combined.convert("RGB")
+    resized = border_rgba.resize(size, Image.LANCZOS)
+    return resized.convert("RGB"), resized.getchannel("A")
 
 
 def _compute_target_size(config: StylingConfig) -> tuple[int, int]:
@@ -85,10 +162,10 @@ def _compute_target_size(config: StylingConfig) -> tuple[int, int]:
     if min_w <= 0 or min_h <= 0:
         raise InvalidConfigurationError("min_size 必须大于 0")
 
-    scale = max(min_w / ratio_w, min_h / ratio_h)
-    target_w = int(math.ceil(ratio_w * scale))
-    target_h = int(math.ceil(ratio_h * scale))
-    return target_w, target_h
+    # 纯整数运算：以约束更紧的一边取最小值，另一边向上取整，避免浮点误差多出 1 像素。
+    if min_w * ratio_h >= min_h * ratio_w:
+        return min_w, -(-min_w * ratio_h // ratio_w)
+    return -(-min_h * ratio_w // ratio_h), min_h
 
 
 def _should_resize(size: tuple[int, int], config: StylingConfig) -> bool:
@@ -2,21 +2,31 @@
 
 from __future__ import annotations
 
-import random
+import logging
+from contextlib import ExitStack
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Optional
 
+import numpy as np
 from PIL import Image
 
+from image_automation.core import image_pool
 from image_automation.core.config import AntiDedupConfig, StylingConfig, ValidationConfig
 from image_automation.core.exceptions import InvalidConfigurationError
 from image_automation.core.models import FileOutcome
 from image_automation.core.output_manager import ImageWriteError, save_image_file
 from image_automation.processing.antidedup import apply_antidedup
-from image_automation.processing.image_loader import ImageLoadingError, load_image
-from image_automation.processing.styling import apply_styling
-from image_automation.processing.validation import compute_phash_distance, compute_ssim
+from image_automation.processing.image_loader import (
+    ImageLoadingError,
+    ImageTooLargeError,
+    load_image,
+)
+from image_automation.processing.styling import apply_styling, draft_size_for
+from image_automation.processing.validation import compute_similarity
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclass(slots=True)
@@ -31,78 +41,99 @@ class ProcessingTask:
     anti_dedup: AntiDedupConfig
     random_seed: int
     validation: ValidationConfig
+    max_source_bytes: Optional[int] = None
+    max_source_pixels: Optional[int] = None
 
 
 def run_task(task: ProcessingTask) -> FileOutcome:
-    """在工作进程中执行完整的处理流程。"""
+    """在工作进程中执行完整的处理流程。
+
+    中间图像在不再需要时立即归还缓冲池，其余图像由 ``ExitStack`` 在任意返回路径上统一归还。
+    """
 
-    rng = random.Random(task.random_seed)
-    image: Optional[Image.Image] = None
+    rng = np.random.default_rng(task.random_seed)
     styled_image: Optional[Image.Image] = None
     processed_image: Optional[Image.Image] = None
     phash_distance: Optional[float] = None
     ssim_value: Optional[float] = None
     validation_note: Optional[str] = None
 
-    try:
-        image = load_image(task.source_path)
-    except ImageLoadingError as exc:
-        return FileOutcome(
-            source_path=task.source_path,
-            status="error-load",
-            message=str(exc),
-        )
-
-    try:
-        styled_image = apply_styling(image, task.styling)
-    except InvalidConfigurationError as exc:
-        _close_if_needed(image)
-        return FileOutcome(
-            source_path=task.source_path,
-            status="error-style",
-            message=str(exc),
-        )
-
-    try:
-        processed_image, operations = apply_antidedup(styled_image, task.anti_dedup, rng)
-    except Exception as exc:  # noqa: BLE001
-        _close_if_needed(image, styled_image)
-        return FileOutcome(
-            source_path=task.source_path,
-            status="error-antidedup",
-            message=str(exc),
-        )
-
-    status = "processed"
-    if task.decision_action == "overwrite":
-        status = "processed-overwrite"
-    elif task.decision_action == "rename":
-        status = "processed-rename"
-
-    try:
-        save_image_file(processed_image, task.dest_path)
-    except ImageWriteError as exc:
-        _close_if_needed(image, styled_image, processed_image)
-        return FileOutcome(
-            source_path=task.source_path,
-            status="error-write",
-            message=str(exc),
-        )
-
-    if task.validation.enabled:
-        if image is not None and processed_image is not None:
+    with ExitStack() as stack:
+        try:
+            image = load_image(
+                task.source_path,
+                draft_size=partial(draft_size_for, config=task.styling),
+                max_bytes=task.max_source_bytes,
+                max_pixels=task.max_source_pixels,
+            )
+        except ImageTooLargeError as exc:
+            return FileOutcome(
+                source_path=task.source_path,
+                status="skip-oversize",
+                message=str(exc),
+            )
+        except ImageLoadingError as exc:
+            return FileOutcome(
+                source_path=task.source_path,
+                status="error-load",
+                message=str(exc),
+            )
+        # 原图只在校验时还会用到，否则样式处理完成后立即归还。
+        keep_source = task.validation.enabled
+        if keep_source:
+            stack.callback(image_pool.release, image)
+
+        try:
+            styled_image = apply_styling(image, task.styling)
+        except InvalidConfigurationError as exc:
+            return FileOutcome(
+                source_path=task.source_path,
+                status="error-style",
+                message=str(exc),
+            )
+        finally:
+            # 无需缩放时风格化直接沿用原图，所有权随 styled_image 转移。
+            if not keep_source and styled_image is not image:
+                image_pool.release(image)
+
+        try:
+            processed_image, operations = apply_antidedup(styled_image, task.anti_dedup, rng)
+        except Exception as exc:  # noqa: BLE001
+            return FileOutcome(
+                source_path=task.source_path,
+                status="error-antidedup",
+                message=str(exc),
+            )
+        finally:
+            # 扰动未生成新图像时二者为同一对象，交由下方统一归还；校验仍需的原图也不在此归还。
+            if processed_image is not styled_image and not (keep_source and styled_image is image):
+                image_pool.release(styled_image)
+        if not (keep_source and processed_image is image):
+            stack.callback(image_pool.release, processed_image)
+
+        status = "processed"
+        if task.decision_action == "overwrite":
+            status = "processed-overwrite"
+        elif task.decision_action == "rename":
+            status = "processed-rename"
+
+        try:
+            save_image_file(processed_image, task.dest_path)
+        except ImageWriteError as exc:
+            return FileOutcome(
+                source_path=task.source_path,
+                status="error-write",
+                message=str(exc),
+            )
+
+        if keep_source:
             try:
-                phash_distance = compute_phash_distance(image, processed_image)
-                ssim_value = compute_ssim(image, processed_image)
+                phash_distance, ssim_value = compute_similarity(image, processed_image)
                 validation_note = f"validation: phash={phash_distance:.0f}, ssim={ssim_value:.4f}"
             except Exception as exc:  # noqa: BLE001
                 validation_note = f"validation-error: {exc}"
-        else:
-            validation_note = "validation-skipped: missing image data"
 
     note = _compose_note(task.decision_note, operations, validation_note)
-    _close_if_needed(image, styled_image, processed_image)
-
     return FileOutcome(
         source_path=task.source_path,
         status=status,
@@ -113,20 +144,20 @@ def run_task(task: ProcessingTask) -> FileOutcome:
     )
 
 
+def run_task_safely(task: ProcessingTask) -> FileOutcome:
+    """执行任务并将未预期的异常转换为失败记录，避免批量 map 因单个任务中断。"""
+
+    try:
+        return run_task(task)
+    except Exception as exc:  # noqa: BLE001
+        LOGGER.exception("任务执行异常：%s", task.source_path)
+        return FileOutcome(
+            source_path=task.source_path,
+            status="error-worker",
+            message=str(exc),
+        )
+
+
 def _compose_note(decision_note: Optional[str], operations: list[str], extra_note: Optional[str] = None) -> Optional[str]:
-    parts: list[str] = []
-    if decision_note:
-        parts.append(decision_note)
-    if operations:
-        parts.append("antidedup: " + ", ".join(operations))
-    if extra_note:
-        parts.append(extra_note)
-    if not parts:
-        return None
-    return "; ".join(parts)
-
-
-def _close_if_needed(*images: Optional[Image.Image]) -> None:
-    for img in images:
-        if img is not None:
-            img.close()
+    antidedup_note = f"antidedup: {', '.join(operations)}" if operations else None
+    return "; ".join(part for part in (decision_note, antidedup_note, extra_note) if part) or None
@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import re
-from typing import Tuple
+from functools import lru_cache
+from typing import Optional, Tuple
 
 from image_automation.core.exceptions import InvalidConfigurationError
 
@@ -16,15 +17,23 @@ def parse_hex_color(value: str) -> Tuple[int, int, int]:
     if not value:
         raise InvalidConfigurationError("颜色值不能为空")
 
-    match = HEX_COLOR_RE.match(value.strip())
-    if not match:
+    rgb = _parse_normalized_hex(value.strip().lower())
+    if rgb is None:
         raise InvalidConfigurationError(f"无法解析颜色值: {value}")
+    return rgb
+
+
+@lru_cache(maxsize=256)
+def _parse_normalized_hex(value: str) -> Optional[Tuple[int, int, int]]:
+    """解析已去空白并转小写的 HEX 字符串；结果按值缓存，批处理中同一配置颜色只解析一次。"""
+
+    match = HEX_COLOR_RE.match(value)
+    if not match:
+        return None
 
     hex_value = match.group(1)
     if len(hex_value) == 3:
         hex_value = "".join(ch * 2 for ch in hex_value)
 
-    r = int(hex_value[0:2], 16)
-    g = int(hex_value[2:4], 16)
-    b = int(hex_value[4:6], 16)
+    r, g, b = bytes.fromhex(hex_value)
     return r, g, b
@@ -2,10 +2,10 @@
 
 from __future__ import annotations
 
-import random
 from pathlib import Path
 
-from PIL import Image
+import numpy as np
+from PIL import Image, ImageChops
 
 from image_automation.core.config import (
     AntiDedupConfig,
@@ -26,18 +26,18 @@ def _make_image(color: str = "gray") -> Image.Image:
 def test_antidedup_none_returns_same_image() -> None:
     image = _make_image("blue")
     config = AntiDedupConfig(mode="none")
-    rng = random.Random(123)
+    rng = np.random.default_rng(123)
 
     processed, operations = apply_antidedup(image, config, rng)
 
     assert operations == []
-    assert list(processed.getdata()) == list(image.getdata())
+    assert ImageChops.difference(processed, image).getbbox() is None
 
 
 def test_antidedup_light_applies_jitter_and_noise() -> None:
     image = _make_image("green")
     config = AntiDedupConfig(mode="light", color_jitter_strength=0.05, noise_strength=0.02)
-    rng = random.Random(99)
+    rng = np.random.default_rng(99)
 
     processed, operations = apply_antidedup(image, config, rng)
 
@@ -45,7 +45,7 @@ def test_antidedup_light_applies_jitter_and_noise() -> None:
     assert any(op.startswith("noise") for op in operations)
     # Light扰动应保证尺寸不变且图像内容发生变化。
     assert processed.size == image.size
-    assert list(processed.getdata()) != list(image.getdata())
+    assert ImageChops.difference(processed, image).getbbox() is not None
 
 
 def test_antidedup_medium_applies_rotation() -> None:
@@ -55,7 +55,7 @@ def test_antidedup_medium_applies_rotation() -> None:
         rotation_range=(0.3, 0.3),  # 固定角度以保证旋转执行
         crop_margin=0.02,
     )
-    rng = random.Random(7)
+    rng = np.random.default_rng(7)
 
     processed, operations = apply_antidedup(image, config, rng)
 
@@ -76,13 +76,13 @@ def test_antidedup_heavy_applies_watermarks() -> None:
             scale_range=(0.05, 0.05),
         ),
     )
-    rng = random.Random(2024)
+    rng = np.random.default_rng(2024)
 
     processed, operations = apply_antidedup(image, config, rng)
 
     assert any(op.startswith("watermark") for op in operations)
     assert processed.size == image.size
-    assert list(processed.getdata()) != list(image.getdata())
+    assert ImageChops.difference(processed, image).getbbox() is not None
 
 
 def test_pipeline_records_antidedup_notes(tmp_path: Path) -> None:
@@ -123,10 +123,10 @@ def test_texture_overlay_changes_image(tmp_path: Path) -> None:
         mode="light",
         texture=TextureConfig(enabled=True, image_path=texture_path, opacity=0.5),
     )
-    rng = random.Random(55)
+    rng = np.random.default_rng(55)
 
     processed, operations = apply_antidedup(image, config, rng)
 
     assert any(op.startswith("texture") for op in operations)
     assert processed.size == image.size
-    assert list(processed.getdata()) != list(image.getdata())
+    assert ImageChops.difference(processed, image).getbbox() is not None
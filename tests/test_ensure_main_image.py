@@ -0,0 +1,232 @@
+"""主图尺寸修正工具的单元测试。"""
+
+from __future__ import annotations
+
+import io
+from pathlib import Path
+
+import pytest
+from PIL import Image, ImageDraw
+
+from image_automation.processing.ensure_main_image import ensure_main_image_size
+
+
+@pytest.fixture(autouse=True)
+def _isolated_user_cache(
+    tmp_path_factory: pytest.TempPathFactory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    # OCR 缓存写在用户缓存目录中，测试时重定向到临时目录。
+    cache_home = tmp_path_factory.mktemp("user-cache")
+    monkeypatch.setenv("XDG_CACHE_HOME", str(cache_home))
+    monkeypatch.setenv("LOCALAPPDATA", str(cache_home))
+
+
+def _make_product_folders(root: Path) -> None:
+    for name, size in (("a", (400, 300)), ("b", (800, 800)), ("c", (1000, 1000))):
+        folder = root / name
+        folder.mkdir(parents=True)
+        Image.new("RGB", size, "white").save(folder / "主图01.jpg")
+    (root / "empty").mkdir()
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_ensure_main_image_size_resizes_non_compliant_images(tmp_path: Path, max_workers: int) -> None:
+    _make_product_folders(tmp_path)
+
+    stats = ensure_main_image_size(tmp_path, max_workers=max_workers)
+
+    assert stats.total_folders == 4
+    assert stats.inspected_files == 3
+    assert stats.adjusted_files == 1
+    assert stats.missing_files == 1
+    assert stats.errors == 0
+    with Image.open(tmp_path / "a" / "主图01.jpg") as adjusted:
+        assert adjusted.size == (800, 800)
+    with Image.open(tmp_path / "c" / "主图01.jpg") as untouched:
+        assert untouched.size == (1000, 1000)
+
+
+@pytest.mark.parametrize(
+    ("mode", "save_format"),
+    [
+        ("RGB", "JPEG"),
+        ("L", "JPEG"),
+        ("RGBA", "PNG"),
+        # 主图01.jpg 的实际内容可能是其他格式，按内容格式写回（OpenCV 无法解码 GIF）。
+        ("P", "GIF"),
+        ("RGB", "WEBP"),
+    ],
+)
+def test_resized_main_image_keeps_format_and_mode(tmp_path: Path, mode: str, save_format: str) -> None:
+    folder = tmp_path / "a"
+    folder.mkdir()
+    Image.new(mode, (400, 300)).save(folder / "主图01.jpg", format=save_format)
+
+    stats = ensure_main_image_size(tmp_path)
+
+    assert stats.adjusted_files == 1 and stats.errors == 0
+    with Image.open(folder / "主图01.jpg") as adjusted:
+        assert adjusted.size == (800, 800)
+        assert adjusted.format == save_format
+        assert adjusted.mode == mode
+
+
+def test_forbidden_terms_batch_ocr_per_folder_and_cache_results(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> None:
+    from image_automation.processing import ensure_main_image as module
+
+    folder = tmp_path / "a"
+    folder.mkdir()
+    for offset, name in enumerate(("主图01.jpg", "详情01.jpg", "详情02.png")):
+        image = Image.new("RGB", (800, 800), "white")
+        ImageDraw.Draw(image).rectangle((100 + offset * 50, 100, 300, 200), fill="black")
+        image.save(folder / name)
+    # 纯色图片不可能包含文字，不会进入 tesseract 批次。
+    Image.new("RGB", (800, 800), "white").save(folder / "详情03.jpg")
+
+    calls: list[list[str]] = []
+
+    def fake_run_tesseract(list_file: Path, languages: str, logger: object) -> str:
+        frames = list_file.read_text(encoding="utf-8").splitlines()
+        calls.append(frames)
+        # 列表顺序: 主图01.jpg, 详情01.jpg, 详情02.png
+        return "正品\f联系闲鱼下单\f\f"
+
+    # 安装了 tesserocr 时也固定走命令行批处理路径。
+    monkeypatch.setattr(module, "_tesserocr_api", lambda languages, logger: None)
+    monkeypatch.setattr(module, "_load_pytesseract", lambda logger: True)
+    monkeypatch.setattr(module, "_run_tesseract", fake_run_tesseract)
+
+    stats = ensure_main_image_size(tmp_path, forbidden_terms=["闲鱼"])
+
+    assert len(calls) == 1 and len(calls[0]) == 3
+    assert stats.inspected_files == 4
+    assert stats.deleted_files == 1
+    assert (folder / "主图01.jpg").exists()
+    assert not (folder / "详情01.jpg").exists()
+    assert (folder / "详情02.png").exists()
+
+    # 未改动的文件再次运行时直接命中 OCR 缓存，不再调用 tesseract。
+    calls.clear()
+    rerun = ensure_main_image_size(tmp_path, forbidden_terms=["闲鱼"])
+
+    assert calls == []
+    assert rerun.inspected_files == 3
+    assert rerun.deleted_files == 0
+    # 缓存文件不会写进被清理的主文件夹。
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["a"]
+
+
+def test_forbidden_terms_in_process_ocr_tolerates_per_image_errors(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from image_automation.processing import ensure_main_image as module
+
+    folder = tmp_path / "a"
+    folder.mkdir()
+    for offset, name in enumerate(("主图01.jpg", "详情01.jpg", "详情02.png")):
+        image = Image.new("RGB", (800, 800), "white")
+        ImageDraw.Draw(image).rectangle((100 + offset * 50, 100, 300, 200), fill="black")
+        image.save(folder / name)
+
+    # 按识别顺序返回结果：主图01.jpg 正常、详情01.jpg 识别出错、详情02.png 命中违禁词。
+    results: list[object] = ["正品", RuntimeError("tesseract failed"), "联系闲鱼下单"]
+
+    class FakeApi:
+        def SetImage(self, image: Image.Image) -> None:  # noqa: N802
+            assert image.mode == "L"
+
+        def GetUTF8Text(self) -> str:  # noqa: N802
+            result = results.pop(0)
+            if isinstance(result, Exception):
+                raise result
+            return str(result)
+
+    monkeypatch.setattr(module, "_tesserocr_api", lambda languages, logger: FakeApi())
+    monkeypatch.setattr(module, "_run_tesseract", lambda *args: pytest.fail("命令行不应被调用"))
+
+    stats = ensure_main_image_size(tmp_path, forbidden_terms=["闲鱼"])
+
+    assert results == []
+    assert stats.deleted_files == 1
+    assert (folder / "主图01.jpg").exists()
+    assert (folder / "详情01.jpg").exists()
+    assert not (folder / "详情02.png").exists()
+
+
+@pytest.mark.parametrize(
+    ("name", "save_kwargs"),
+    [("a.jpg", {}), ("b.jpg", {"progressive": True, "exif": Image.Exif()}), ("c.png", {})],
+)
+def test_read_dimensions_matches_pillow(tmp_path: Path, name: str, save_kwargs: dict) -> None:
+    from image_automation.processing.ensure_main_image import _read_dimensions
+
+    path = tmp_path / name
+    Image.new("RGB", (640, 480), "white").save(path, **save_kwargs)
+
+    assert _read_dimensions(path) == (640, 480)
+
+
+def test_read_dimensions_skips_fill_bytes_and_standalone_markers(tmp_path: Path) -> None:
+    from image_automation.processing.ensure_main_image import _read_dimensions
+
+    buffer = io.BytesIO()
+    Image.new("RGB", (640, 480), "white").save(buffer, format="JPEG")
+    data = buffer.getvalue()
+    # SOI 之后插入 TEM、RST0 独立标记，并在下一个标记前加入 0xFF 填充字节。
+    path = tmp_path / "padded.jpg"
+    path.write_bytes(data[:2] + b"\xff\x01\xff\xd0\xff\xff\xff" + data[2:])
+    assert _read_dimensions(path) == (640, 480)
+
+    # 无法识别的字节不猜测尺寸，交给 Pillow 读取。
+    path.write_bytes(data[:2] + b"\x00\x10" + data[2:])
+    assert _read_dimensions(path) is None
+
+
+def test_ocr_cache_errors_fall_back_to_uncached_ocr(
+    tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    from image_automation.processing.ensure_main_image import OcrCache
+
+    cache = OcrCache(tmp_path / "cache.sqlite3")
+    cache.put_many([("digest", "eng", "text")])
+    assert cache.get("digest", "eng") == "text"
+
+    # 模拟数据库被锁等读写异常：之后的查询与写入都直接跳过缓存。
+    cache._conn.close()
+    with caplog.at_level("WARNING"):
+        assert cache.get("digest", "eng") is None
+        cache.put_many([("other", "eng", "text")])
+        assert cache.get("other", "eng") is None
+
+    assert len([record for record in caplog.records if "OCR 缓存" in record.getMessage()]) == 1
+    cache.close()
+
+
+def test_mismatched_batch_ocr_fallback_skips_vanished_images(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from image_automation.processing import ensure_main_image as module
+
+    folder = tmp_path / "a"
+    folder.mkdir()
+    for offset, name in enumerate(("主图01.jpg", "详情01.jpg", "详情02.png")):
+        image = Image.new("RGB", (800, 800), "white")
+        ImageDraw.Draw(image).rectangle((100 + offset * 50, 100, 300, 200), fill="black")
+        image.save(folder / name)
+
+    def fake_run_tesseract(list_file: Path, languages: str, logger: object) -> str:
+        # 批量识别期间文件被外部删除，且返回的页数不足，触发逐张重新识别。
+        (folder / "详情02.png").unlink()
+        return "正品"
+
+    monkeypatch.setattr(module, "_tesserocr_api", lambda languages, logger: None)
+    monkeypatch.setattr(module, "_load_pytesseract", lambda logger: True)
+    monkeypatch.setattr(module, "_run_tesseract", fake_run_tesseract)
+    monkeypatch.setattr(module, "_extract_text", lambda image, languages, logger: "联系闲鱼下单")
+
+    stats = ensure_main_image_size(tmp_path, forbidden_terms=["闲鱼"], stable_order=True)
+
+    # 主图与详情01.jpg 按逐张结果删除；消失的详情02.png 只在后续检查时记为一次异常。
+    assert stats.deleted_files == 2
+    assert stats.errors == 1
+    assert list(folder.iterdir()) == []
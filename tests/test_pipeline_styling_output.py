@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import csv
+from dataclasses import replace
 from pathlib import Path
 
 import pytest
@@ -16,7 +17,11 @@ from image_automation.core.config import (
     TextureConfig,
     ValidationConfig,
 )
+from image_automation.core.image_pool import ImageBufferPool
+from image_automation.core.scanner import collect_source_images
+from image_automation.processing import pipeline
 from image_automation.processing.pipeline import process_batch
+from image_automation.processing.styling import _compute_target_size
 
 
 def make_config(
@@ -27,6 +32,7 @@ def make_config(
     conflict_strategy: str = "rename",
     enable_validation: bool = False,
     texture: TextureConfig | None = None,
+    max_workers: int = 1,
 ) -> JobConfig:
     return JobConfig(
         sources=[source],
@@ -34,7 +40,7 @@ def make_config(
         styling=styling or StylingConfig(),
         anti_dedup=AntiDedupConfig(texture=texture or TextureConfig()),
         validation=ValidationConfig(enabled=enable_validation),
-        max_workers=1,
+        max_workers=max_workers,
     )
 
 
@@ -67,6 +73,25 @@ def test_process_batch_handles_valid_and_invalid_images(tmp_path: Path) -> None:
     assert report.exists()
 
 
+def test_oversized_source_is_skipped(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+
+    Image.new("RGB", (64, 64), "blue").save(source / "small.png")
+    Image.new("RGB", (200, 200), "red").save(source / "huge.png")
+    config = replace(make_config(source, output), max_source_pixels=100 * 100)
+
+    result = process_batch(config)
+
+    assert len(result.succeeded) == 1
+    assert len(result.failed) == 0
+    assert [outcome.status for outcome in result.skipped] == ["skip-oversize"]
+    assert result.skipped[0].source_path.name == "huge.png"
+    assert "上限 10000 像素" in (result.skipped[0].message or "")
+
+
 def test_exif_orientation_is_corrected(tmp_path: Path) -> None:
     source = tmp_path / "input"
     output = tmp_path / "output"
@@ -142,6 +167,34 @@ def test_contain_mode_with_background_and_border(tmp_path: Path) -> None:
         assert processed.getpixel((bg_x, bg_y)) == (255, 0, 0)
 
 
+def test_border_image_overlay_blends_alpha(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+
+    Image.new("RGB", (100, 100), "white").save(source / "square.png")
+    border = Image.new("RGBA", (50, 50), (0, 0, 0, 0))
+    border.paste((0, 0, 255, 255), (0, 0, 50, 5))
+    border.paste((255, 0, 0, 128), (0, 45, 50, 50))
+    border_path = tmp_path / "border.png"
+    border.save(border_path)
+
+    styling = StylingConfig(aspect_ratio=(1, 1), min_size=(100, 100), border_image=border_path)
+    result = process_batch(make_config(source, output, styling=styling))
+
+    out_path = result.succeeded[0].output_path
+    assert out_path is not None
+
+    with Image.open(out_path) as processed:
+        assert processed.mode == "RGB"
+        # 不透明区域完全覆盖，透明区域保留原图，半透明区域按 alpha 混合。
+        assert processed.getpixel((50, 2)) == (0, 0, 255)
+        assert processed.getpixel((50, 50)) == (255, 255, 255)
+        red, green, blue = processed.getpixel((50, 97))
+        assert red == 255 and abs(green - 127) <= 1 and abs(blue - 127) <= 1
+
+
 def test_cover_mode_produces_expected_size(tmp_path: Path) -> None:
     source = tmp_path / "input"
     output = tmp_path / "output"
@@ -165,6 +218,23 @@ def test_cover_mode_produces_expected_size(tmp_path: Path) -> None:
         assert processed.size == (150, 150)
 
 
+@pytest.mark.parametrize(
+    ("aspect_ratio", "min_size", "expected"),
+    [
+        ((1, 1), (800, 800), (800, 800)),
+        ((16, 9), (800, 800), (1423, 800)),
+        ((3, 4), (600, 600), (600, 800)),
+        # 浮点计算 1350 / 21 * 21 会得到 1351。
+        ((21, 9), (1350, 100), (1350, 579)),
+    ],
+)
+def test_compute_target_size_uses_exact_integer_math(
+    aspect_ratio: tuple[int, int], min_size: tuple[int, int], expected: tuple[int, int]
+) -> None:
+    config = StylingConfig(aspect_ratio=aspect_ratio, min_size=min_size)
+    assert _compute_target_size(config) == expected
+
+
 def test_conflict_rename_strategy(tmp_path: Path) -> None:
     source = tmp_path / "input"
     output = tmp_path / "output"
@@ -247,3 +317,173 @@ def test_validation_metrics_recorded(tmp_path: Path) -> None:
         assert "ssim" in row
         assert row["phash_distance"]
         assert row["ssim"]
+
+
+def test_already_sized_image_is_passed_through(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+
+    image = Image.new("RGB", (100, 100), "white")
+    image.paste((0, 128, 255), (20, 20, 60, 80))
+    image.save(source / "sized.png")
+
+    styling = StylingConfig(aspect_ratio=(1, 1), min_size=(100, 100))
+    result = process_batch(make_config(source, output, styling=styling, enable_validation=True))
+
+    record = result.succeeded[0]
+    assert record.phash_distance == 0
+    assert record.ssim == pytest.approx(1.0)
+    with Image.open(record.output_path) as processed:
+        assert processed.tobytes() == image.tobytes()
+
+
+def test_process_batch_with_multiple_workers(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+
+    for idx in range(6):
+        Image.new("RGB", (40, 40), "blue").save(source / f"img_{idx}.png")
+    (source / "broken.png").write_text("not an image")
+
+    result = process_batch(make_config(source, output, max_workers=2))
+
+    assert len(result.succeeded) == 6
+    assert len(result.failed) == 1
+    assert result.failed[0].status == "error-load"
+
+
+def test_broken_worker_pool_marks_remaining_tasks_failed(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    from concurrent.futures.process import BrokenProcessPool
+
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    source.mkdir()
+    output.mkdir()
+    for index in range(3):
+        Image.new("RGB", (64, 64), "blue").save(source / f"image{index}.png")
+
+    class DyingExecutor:
+        """首个任务正常完成后模拟工作进程被系统杀死。"""
+
+        def map(self, fn, tasks, chunksize=1):  # noqa: ANN001, ANN202
+            yield fn(tasks[0])
+            raise BrokenProcessPool("worker killed")
+
+    monkeypatch.setattr(pipeline, "_bounded_worker_count", lambda requested: 2)
+    monkeypatch.setattr(pipeline, "_get_pool", lambda max_workers: DyingExecutor())
+
+    result = process_batch(make_config(source, output, max_workers=2))
+
+    assert len(result.succeeded) == 1
+    assert [outcome.status for outcome in result.failed] == ["error-worker", "error-worker"]
+    with (output / "report.csv").open(encoding="utf-8") as handle:
+        assert len(list(csv.reader(handle))) == 4
+
+
+def test_worker_count_bounded_by_cpu_and_memory(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(pipeline.os, "cpu_count", lambda: 8)
+    monkeypatch.setattr(pipeline, "_available_memory_bytes", lambda: None)
+    assert pipeline._bounded_worker_count(16) == 8
+    assert pipeline._bounded_worker_count(4) == 4
+
+    monkeypatch.setattr(pipeline, "_available_memory_bytes", lambda: 3 * pipeline.WORKER_MEMORY_BUDGET)
+    assert pipeline._bounded_worker_count(4) == 3
+
+    monkeypatch.setattr(pipeline, "_available_memory_bytes", lambda: 0)
+    assert pipeline._bounded_worker_count(4) == 1
+
+
+def test_scanner_applies_include_and_exclude_patterns(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    nested = source / "nested"
+    nested.mkdir(parents=True)
+
+    Image.new("RGB", (10, 10)).save(source / "keep.PNG")
+    Image.new("RGB", (10, 10)).save(nested / "keep.jpg")
+    Image.new("RGB", (10, 10)).save(source / "draft_skip.png")
+    # 与 Path.suffix 一致，名为 ".jpg" 的隐藏文件没有扩展名。
+    Image.new("RGB", (10, 10)).save(source / ".jpg", format="JPEG")
+    (source / "readme.txt").write_text("hello")
+
+    job = JobConfig(
+        sources=[source],
+        output=OutputConfig(output_dir=tmp_path / "output"),
+        styling=StylingConfig(),
+        anti_dedup=AntiDedupConfig(),
+        exclude_patterns=("draft_*",),
+    )
+
+    names = sorted(item.source_path.name for item in collect_source_images(job))
+
+    assert names == ["keep.PNG", "keep.jpg"]
+
+
+def test_scanner_resolves_relative_sources_against_current_directory(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    for project, name in (("a", "first.png"), ("b", "second.png")):
+        source = tmp_path / project / "input"
+        source.mkdir(parents=True)
+        Image.new("RGB", (10, 10)).save(source / name)
+
+    job = make_config(Path("input"), tmp_path / "output")
+
+    # GUI 进程中工作目录可能变化，相对源路径每次扫描都按当前目录重新解析。
+    monkeypatch.chdir(tmp_path / "a")
+    assert [item.source_path.name for item in collect_source_images(job)] == ["first.png"]
+    monkeypatch.chdir(tmp_path / "b")
+    assert [item.source_path.name for item in collect_source_images(job)] == ["second.png"]
+
+
+def test_image_buffer_pool_reuses_released_buffers() -> None:
+    pool = ImageBufferPool(max_per_key=1)
+
+    first = pool.acquire("RGB", (20, 20), (255, 0, 0))
+    pool.release(first)
+    pool.release(first)  # 重复归还不应导致同一缓冲区被借出两次
+    second = pool.acquire("RGB", (20, 20), (0, 0, 255))
+    third = pool.acquire("RGB", (20, 20))
+
+    assert second is first
+    assert second.getpixel((0, 0)) == (0, 0, 255)
+    assert third is not first
+
+
+def test_conflict_rename_continues_after_highest_index(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    (source / "a").mkdir(parents=True)
+    (source / "b").mkdir(parents=True)
+    output.mkdir()
+
+    Image.new("RGB", (50, 50), "blue").save(source / "a" / "dup.png")
+    Image.new("RGB", (50, 50), "blue").save(source / "b" / "dup.png")
+    Image.new("RGB", (50, 50), "white").save(output / "dup.png")
+    Image.new("RGB", (50, 50), "white").save(output / "dup_3.png")
+
+    result = process_batch(make_config(source, output, conflict_strategy="rename"))
+
+    names = sorted(outcome.output_path.name for outcome in result.succeeded if outcome.output_path)
+    assert names == ["dup_4.png", "dup_5.png"]
+
+
+def test_duplicate_source_names_reserve_distinct_outputs(tmp_path: Path) -> None:
+    source = tmp_path / "input"
+    output = tmp_path / "output"
+    (source / "a").mkdir(parents=True)
+    (source / "b").mkdir(parents=True)
+    output.mkdir()
+
+    Image.new("RGB", (50, 50), "blue").save(source / "a" / "same.png")
+    Image.new("RGB", (50, 50), "red").save(source / "b" / "same.png")
+
+    result = process_batch(make_config(source, output, conflict_strategy="rename"))
+
+    names = sorted(outcome.output_path.name for outcome in result.succeeded if outcome.output_path)
+    assert names == ["same.png", "same_1.png"]
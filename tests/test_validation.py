@@ -0,0 +1,49 @@
+"""验证指标计算的单元测试。"""
+
+from __future__ import annotations
+
+import cv2
+import numpy as np
+from PIL import Image, ImageDraw
+
+from image_automation.processing.validation import (
+    _PHASH_BASIS,
+    compute_phash_distance,
+    compute_similarity,
+    compute_ssim,
+)
+
+
+def _sample_image(offset: int = 0) -> Image.Image:
+    image = Image.new("RGB", (128, 128), "white")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((10 + offset, 20, 70 + offset, 90), fill="black")
+    draw.ellipse((60, 60 - offset, 120, 120 - offset), fill=(200, 30, 30))
+    return image
+
+
+def test_identical_images_have_zero_distance_and_full_ssim() -> None:
+    image = _sample_image()
+
+    assert compute_phash_distance(image, image.copy()) == 0.0
+    assert compute_ssim(image, image.copy()) == 1.0
+
+
+def test_phash_basis_matches_full_dct() -> None:
+    rng = np.random.default_rng(7)
+    array = rng.integers(0, 256, (32, 32)).astype(np.float32)
+
+    expected = cv2.dct(array)[:8, :8]
+    actual = _PHASH_BASIS @ array @ _PHASH_BASIS.T
+
+    np.testing.assert_allclose(actual, expected, rtol=1e-4, atol=1e-2)
+
+
+def test_compute_similarity_matches_individual_metrics() -> None:
+    original = _sample_image()
+    processed = _sample_image(offset=6).resize((96, 96))
+
+    phash_distance, ssim_value = compute_similarity(original, processed)
+
+    assert phash_distance == compute_phash_distance(original, processed)
+    assert ssim_value == compute_ssim(original, processed)